@@ -1,25 +1,28 @@
+import asyncio
 import os
 from pathlib import Path
 
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 from anthropic.types import MessageParam
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
-def count_tokens():
+async def count_tokens():
     # Model specified in the task
     target_model = "claude-haiku-4-5"
 
-    client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY", "your-api-key"))
+    client = AsyncAnthropic(api_key=os.environ.get("ANTHROPIC_API_KEY", "your-api-key"))
 
     project_root = Path(__file__).parent.parent
     system_prompt_path = project_root / "prompts" / "extractor_system.jinja2"
+    instructions_path = project_root / "prompts" / "extractor_user_instructions.jinja2"
     user_prompt_path = project_root / "prompts" / "extractor_user.jinja2"
 
     try:
         system_content = system_prompt_path.read_text(encoding="utf-8")
+        instructions_content = instructions_path.read_text(encoding="utf-8")
         user_content = user_prompt_path.read_text(encoding="utf-8")
     except FileNotFoundError as e:
         print(f"Error: {e}")
@@ -40,18 +43,30 @@ def count_tokens():
     try:
         # System prompt tokens
         messages: list[MessageParam] = [{"role": "user", "content": "Hello"}]
-        system_tokens = client.messages.count_tokens(
+        system_coro = client.messages.count_tokens(
             model=target_model, system=system_content, messages=messages
-        ).input_tokens
+        )
         # This counts system + a small user message.
 
         # Base user prompt tokens (without system)
+        # (instructions block + OCR block, as sent by the extractor)
         user_messages: list[MessageParam] = [
-            {"role": "user", "content": user_content_filled}
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": instructions_content},
+                    {"type": "text", "text": user_content_filled},
+                ],
+            }
         ]
-        user_tokens = client.messages.count_tokens(
+        user_coro = client.messages.count_tokens(
             model=target_model, messages=user_messages
-        ).input_tokens
+        )
+
+        # Both counts are independent, so issue them concurrently
+        system_count, user_count = await asyncio.gather(system_coro, user_coro)
+        system_tokens = system_count.input_tokens
+        user_tokens = user_count.input_tokens
 
         # Let's also count them separately if possible or just report these.
         # Anthropic's count_tokens returns the total input tokens for the request.
@@ -60,7 +75,10 @@ def count_tokens():
         print(f"System Prompt ({system_prompt_path.name}):")
         print(f"  Approx. tokens (including small user message): {system_tokens}")
 
-        print(f"\nUser Prompt ({user_prompt_path.name}) with placeholder:")
+        print(
+            f"\nUser Prompt ({instructions_path.name} + {user_prompt_path.name}) "
+            "with placeholder:"
+        )
         print(f"  Approx. tokens: {user_tokens}")
 
         # If we want just the system prompt tokens, we can try to subtract.
@@ -72,4 +90,4 @@ def count_tokens():
 
 
 if __name__ == "__main__":
-    count_tokens()
+    asyncio.run(count_tokens())
@@ -1,13 +1,31 @@
-"""Slipstream integrations module."""
+"""Slipstream integrations module.
 
-from slipstream.integrations.anthropic_extractor import (
-    AnthropicExtractor,
-    ExtractionError,
-    ExtractionIncompleteError,
-    ExtractionRefusedError,
-)
-from slipstream.integrations.gdrive import GDriveClient
-from slipstream.integrations.ocr import OCREngine
+Integrations are imported lazily on first attribute access, so importing one
+integration (or the CLI) does not pay for every SDK, in particular Anthropic's.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from slipstream.integrations.anthropic_extractor import (
+        AnthropicExtractor,
+        ExtractionError,
+        ExtractionIncompleteError,
+        ExtractionRefusedError,
+    )
+    from slipstream.integrations.gdrive import GDriveClient
+    from slipstream.integrations.ocr import OCREngine
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "AnthropicExtractor": "anthropic_extractor",
+    "ExtractionError": "anthropic_extractor",
+    "ExtractionRefusedError": "anthropic_extractor",
+    "ExtractionIncompleteError": "anthropic_extractor",
+    "GDriveClient": "gdrive",
+    "OCREngine": "ocr",
+}
 
 __all__ = [
     "AnthropicExtractor",
@@ -17,3 +35,13 @@ __all__ = [
     "GDriveClient",
     "OCREngine",
 ]
+
+
+def __getattr__(name: str) -> object:
+    """Import the submodule defining a public name on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    # Cache on the package so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
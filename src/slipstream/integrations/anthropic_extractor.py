@@ -1,23 +1,64 @@
 """Anthropic API integration for receipt data extraction using structured outputs."""
 
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
 import time
 from pathlib import Path
 
-from anthropic import AsyncAnthropic
+from anthropic import APIConnectionError, APIStatusError, AsyncAnthropic
 from anthropic.types.beta import (
     BetaCacheControlEphemeralParam,
     BetaMessageParam,
     BetaTextBlockParam,
 )
 from jinja2 import Environment, FileSystemLoader, select_autoescape
+from pydantic import BaseModel, ValidationError
 from tenacity import (
     retry,
-    retry_if_exception_type,
+    retry_if_exception,
     stop_after_attempt,
+    wait_random_exponential,
 )
 
 from slipstream.models import ExtractionResult, Receipt
 
+# Bump whenever the prompt templates change in a way that affects output,
+# so stale entries in the extraction cache are not reused.
+PROMPT_VERSION = "3"
+
+# Fingerprint of the Receipt output schema, which is sent with every request.
+# Any change to the model changes this value, so cached extractions are
+# invalidated automatically without a manual version bump.
+SCHEMA_VERSION = hashlib.sha256(
+    json.dumps(Receipt.model_json_schema(), sort_keys=True).encode("utf-8")
+).hexdigest()[:12]
+
+# Floor for the adaptive output cap, covering the structured fields themselves
+MIN_OUTPUT_TOKENS = 256
+
+# Polling bounds (seconds) while waiting for a Message Batch to finish
+BATCH_POLL_INITIAL_DELAY = 5.0
+BATCH_POLL_MAX_DELAY = 60.0
+
+
+# Default number of receipts packed into one request by extract_receipts_packed
+PACKED_BATCH_SIZE = 5
+
+# Ceiling for a packed request's output cap. The SDK refuses non-streaming
+# requests whose max_tokens implies more than ten minutes of output (about
+# 21k tokens), so a large chunk is capped here and falls back to single
+# requests if its response is truncated.
+PACKED_MAX_OUTPUT_TOKENS = 16_384
+
+
+class _ReceiptBatch(BaseModel):
+    """Structured output wrapper for several receipts extracted in one request."""
+
+    receipts: list[Receipt]
+
 
 class ExtractionError(Exception):
     """Base exception for extraction errors."""
@@ -31,6 +72,34 @@ class ExtractionIncompleteError(ExtractionError):
     """Raised when the response is truncated due to token limits."""
 
 
+def _is_retryable_error(exception: BaseException) -> bool:
+    """Determine if an exception should trigger a retry.
+
+    Retries on:
+    - Connection errors and timeouts
+    - HTTP 429 (rate limit exceeded)
+    - HTTP 5xx (server errors, including 529 overloaded)
+
+    Does NOT retry on:
+    - Other client errors (400 bad request, 401/403 auth, 404, ...)
+    - ExtractionRefusedError / ExtractionIncompleteError (deterministic)
+
+    Args:
+        exception: The exception to check
+
+    Returns:
+        True if the exception is retryable, False otherwise
+    """
+    if isinstance(exception, APIConnectionError):
+        return True
+
+    if isinstance(exception, APIStatusError):
+        status = exception.status_code
+        return status == 429 or status >= 500
+
+    return False
+
+
 class AnthropicExtractor:
     """
     Anthropic-powered receipt data extractor using structured outputs.
@@ -46,6 +115,7 @@ class AnthropicExtractor:
         max_tokens: int = 2048,
         temperature: float = 0.0,
         prompts_dir: str | None = None,
+        cache_dir: Path | None = None,
     ) -> None:
         """
         Initialize the Anthropic extractor.
@@ -56,11 +126,15 @@ class AnthropicExtractor:
             max_tokens: Maximum tokens for response (default: 2048)
             temperature: Sampling temperature (default: 0.0 for deterministic)
             prompts_dir: Directory containing Jinja2 templates (default: ./prompts)
+            cache_dir: Optional directory for caching extraction results keyed
+                by OCR text, model, prompt version, and output schema version
+                (default: no caching)
         """
         self.client = AsyncAnthropic(api_key=api_key)
         self.model = model
         self.max_tokens = max_tokens
         self.temperature = temperature
+        self.cache_dir = cache_dir
 
         # Set up Jinja2 environment for prompt templates
         if prompts_dir is None:
@@ -73,8 +147,32 @@ class AnthropicExtractor:
             autoescape=select_autoescape(),
             trim_blocks=True,
             lstrip_blocks=True,
+            # Templates do not change at runtime; skip the per-lookup stat
+            auto_reload=False,
         )
 
+        # The system prompt and user instructions take no variables, so render
+        # them once up front
+        self._system_prompt = self.jinja_env.get_template(
+            "extractor_system.jinja2"
+        ).render()
+        self._user_instructions = self.jinja_env.get_template(
+            "extractor_user_instructions.jinja2"
+        ).render()
+        self._user_template = self.jinja_env.get_template("extractor_user.jinja2")
+
+    async def __aenter__(self) -> "AnthropicExtractor":
+        """Enter an async context, keeping one client for all extractions."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the underlying HTTP connection pool on context exit."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying Anthropic client and its connection pool."""
+        await self.client.close()
+
     def _render_prompts(self, ocr_text: str) -> tuple[str, str]:
         """
         Render system and user prompts from Jinja2 templates.
@@ -85,17 +183,234 @@ class AnthropicExtractor:
         Returns:
             Tuple of (system_prompt, user_prompt)
         """
-        system_template = self.jinja_env.get_template("extractor_system.jinja2")
-        user_template = self.jinja_env.get_template("extractor_user.jinja2")
+        user_prompt = self._user_template.render(OCR_TEXT=ocr_text)
+
+        return self._system_prompt, user_prompt
+
+    def _user_content(self, user_prompt: str) -> list[BetaTextBlockParam]:
+        """
+        Build the user message content blocks.
+
+        The static instructions come first and carry the prompt cache
+        breakpoint, so the cached prefix spans the system prompt plus the
+        instructions. Only this last static block is marked, keeping well
+        within the API's limit on cache breakpoints.
+
+        Args:
+            user_prompt: Rendered per-receipt user prompt (OCR text)
+
+        Returns:
+            List of text blocks for the user message
+        """
+        return [
+            BetaTextBlockParam(
+                type="text",
+                text=self._user_instructions,
+                cache_control=BetaCacheControlEphemeralParam(type="ephemeral"),
+            ),
+            BetaTextBlockParam(type="text", text=user_prompt),
+        ]
+
+    def _cache_key(self, ocr_text: str) -> str:
+        """
+        Compute the content-addressable cache key for an extraction.
+
+        Each field is prefixed with its 8-byte length so that different
+        field boundaries can never produce the same digest.
+
+        Args:
+            ocr_text: Raw OCR text used as extraction input
+
+        Returns:
+            Hex-encoded SHA-256 digest
+        """
+        digest = hashlib.sha256()
+        for field in (self.model, PROMPT_VERSION, SCHEMA_VERSION, ocr_text):
+            data = field.encode("utf-8")
+            digest.update(len(data).to_bytes(8, "big"))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def _load_cached(self, key: str) -> Receipt | None:
+        """
+        Load a cached Receipt, ignoring missing or invalid entries.
+
+        Args:
+            key: Cache key from _cache_key
+
+        Returns:
+            The cached Receipt, or None on a cache miss
+        """
+        if self.cache_dir is None:
+            return None
+        try:
+            data = (self.cache_dir / f"{key}.json").read_text(encoding="utf-8")
+            return Receipt.model_validate_json(data)
+        except (OSError, ValueError):
+            return None
+
+    def _store_cached(self, key: str, receipt: Receipt) -> None:
+        """
+        Atomically write a Receipt to the cache (temp file + rename).
+
+        Write failures are ignored since the cache is best-effort.
+
+        Args:
+            key: Cache key from _cache_key
+            receipt: Receipt to cache
+        """
+        if self.cache_dir is None:
+            return
+        tmp_path: str | None = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(receipt.model_dump_json())
+            os.replace(tmp_path, self.cache_dir / f"{key}.json")
+        except OSError:
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+
+    def _cached_result(
+        self, ocr_text: str, start_time: float
+    ) -> ExtractionResult | None:
+        """
+        Look up a previous extraction of ocr_text in the extraction cache.
+
+        Args:
+            ocr_text: Raw OCR text used as extraction input
+            start_time: When the extraction started, for processing_time
+
+        Returns:
+            An ExtractionResult with zero token usage, or None on a cache miss
+            or when caching is disabled
+        """
+        if self.cache_dir is None:
+            return None
+        cached_receipt = self._load_cached(self._cache_key(ocr_text))
+        if cached_receipt is None:
+            return None
+        return ExtractionResult(
+            receipt=cached_receipt,
+            input_tokens=0,
+            output_tokens=0,
+            processing_time=time.time() - start_time,
+        )
+
+    async def _parse(
+        self,
+        system_prompt: str,
+        messages: list[BetaMessageParam],
+        max_tokens: int,
+        output_format: type[BaseModel] = Receipt,
+    ):
+        """
+        Call the Anthropic API with structured outputs.
+
+        Args:
+            system_prompt: Rendered system prompt
+            messages: Conversation messages to send
+            max_tokens: Maximum tokens for the response
+            output_format: Pydantic model the response must conform to
+
+        Returns:
+            The parsed beta message response
+        """
+        return await self.client.beta.messages.parse(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=self.temperature,
+            betas=["structured-outputs-2025-11-13"],
+            system=[BetaTextBlockParam(type="text", text=system_prompt)],
+            messages=messages,
+            output_format=output_format,
+        )
+
+    @retry(
+        retry=retry_if_exception(_is_retryable_error),
+        stop=stop_after_attempt(3),
+        wait=wait_random_exponential(min=1, max=30),
+        reraise=True,
+    )
+    async def _parse_packed(self, messages: list[BetaMessageParam], max_tokens: int):
+        """
+        Send a packed request, retrying transient API errors.
+
+        Uses the same retry policy as extract_receipt_data.
+
+        Args:
+            messages: Conversation messages carrying the packed receipts
+            max_tokens: Maximum tokens for the response
+
+        Returns:
+            The parsed beta message response
+        """
+        return await self._parse(
+            self._system_prompt, messages, max_tokens, output_format=_ReceiptBatch
+        )
+
+    def _output_token_budget(self, ocr_text: str) -> int:
+        """
+        Estimate an output token cap proportional to the receipt's size.
+
+        The response echoes the OCR text in raw_text plus the structured
+        fields, so the cap scales with the input. UTF-8 bytes / 3 roughly
+        tracks tokens for both Latin text and CJK (3 bytes, ~1 token each).
+
+        Args:
+            ocr_text: Raw OCR text from receipt image
+
+        Returns:
+            Token cap, never above the configured max_tokens
+        """
+        approx_tokens = len(ocr_text.encode("utf-8")) // 3
+        return min(self.max_tokens, MIN_OUTPUT_TOKENS + 2 * approx_tokens)
 
-        system_prompt = system_template.render()
-        user_prompt = user_template.render(OCR_TEXT=ocr_text)
+    async def _parse_with_feedback(
+        self, system_prompt: str, user_prompt: str, max_tokens: int
+    ):
+        """
+        Call the API, feeding a schema validation error back to the model once.
 
-        return system_prompt, user_prompt
+        Args:
+            system_prompt: Rendered system prompt
+            user_prompt: Rendered per-receipt user prompt
+            max_tokens: Maximum tokens for the response
+
+        Returns:
+            The parsed beta message response
+        """
+        # Construct properly typed message
+        messages: list[BetaMessageParam] = [
+            {"role": "user", "content": self._user_content(user_prompt)}
+        ]
+
+        try:
+            response = await self._parse(system_prompt, messages, max_tokens)
+        except ValidationError as e:
+            # Feed the validation error back to the model and retry once
+            feedback = (
+                "Your previous response did not match the required schema:\n"
+                f"{e}\nReturn a corrected response."
+            )
+            messages = [
+                {
+                    "role": "user",
+                    "content": [
+                        *self._user_content(user_prompt),
+                        BetaTextBlockParam(type="text", text=feedback),
+                    ],
+                }
+            ]
+            response = await self._parse(system_prompt, messages, max_tokens)
+
+        return response
 
     @retry(
-        retry=retry_if_exception_type(Exception),
+        retry=retry_if_exception(_is_retryable_error),
         stop=stop_after_attempt(3),
+        wait=wait_random_exponential(min=1, max=30),
         reraise=True,
     )
     async def extract_receipt_data(
@@ -105,11 +420,14 @@ class AnthropicExtractor:
         Extract structured receipt data from OCR text using structured outputs.
 
         This method uses Anthropic's structured outputs beta feature to ensure
-        the response matches the Receipt Pydantic model schema.
+        the response matches the Receipt Pydantic model schema. When a
+        cache_dir is configured, identical inputs are served from disk
+        without calling the API.
 
         Args:
             ocr_text: Raw OCR text from receipt image
-            max_tokens: Override default max_tokens if specified
+            max_tokens: Override the output cap. By default the cap is sized
+                to the OCR text, up to the configured max_tokens.
 
         Returns:
             ExtractionResult containing the validated Receipt and metadata
@@ -117,32 +435,34 @@ class AnthropicExtractor:
         Raises:
             ExtractionRefusedError: If the model refuses the request
             ExtractionIncompleteError: If response is truncated
-            Exception: For other API errors (with retry)
+            ValidationError: If the response still fails schema validation
+                after one feedback retry
+            anthropic.APIError: For API errors (transient ones are retried
+                with exponential backoff)
         """
         start_time = time.time()
 
+        # Serve identical inputs from the extraction cache if enabled
+        cached_result = self._cached_result(ocr_text, start_time)
+        if cached_result is not None:
+            return cached_result
+        cache_key = self._cache_key(ocr_text) if self.cache_dir else None
+
         # Render prompts
         system_prompt, user_prompt = self._render_prompts(ocr_text)
 
-        # Construct properly typed message
-        messages: list[BetaMessageParam] = [{"role": "user", "content": user_prompt}]
-
-        # Call Anthropic API with structured outputs and prompt caching
-        response = await self.client.beta.messages.parse(
-            model=self.model,
-            max_tokens=max_tokens or self.max_tokens,
-            temperature=self.temperature,
-            betas=["structured-outputs-2025-11-13"],
-            system=[
-                BetaTextBlockParam(
-                    type="text",
-                    text=system_prompt,
-                    cache_control=BetaCacheControlEphemeralParam(type="ephemeral"),
-                )
-            ],
-            messages=messages,
-            output_format=Receipt,
-        )
+        # Size the output cap to the receipt; if that proves too small, retry
+        # once with the configured maximum before reporting truncation
+        budget = max_tokens or self._output_token_budget(ocr_text)
+        response = await self._parse_with_feedback(system_prompt, user_prompt, budget)
+        if (
+            response.stop_reason == "max_tokens"
+            and max_tokens is None
+            and budget < self.max_tokens
+        ):
+            response = await self._parse_with_feedback(
+                system_prompt, user_prompt, self.max_tokens
+            )
 
         # Handle edge cases based on stop_reason
         if response.stop_reason == "refusal":
@@ -156,6 +476,9 @@ class AnthropicExtractor:
         # Extract validated Receipt from parsed_output
         receipt: Receipt = response.parsed_output  # type: ignore
 
+        if cache_key:
+            self._store_cached(cache_key, receipt)
+
         # Calculate processing time
         processing_time = time.time() - start_time
 
@@ -170,3 +493,313 @@ class AnthropicExtractor:
         )
 
         return result
+
+    async def extract_receipt_data_batch(
+        self,
+        ocr_texts: list[str],
+        max_concurrency: int = 10,
+        requests_per_minute: int | None = None,
+    ) -> list[ExtractionResult | Exception]:
+        """
+        Extract structured receipt data from multiple OCR texts concurrently.
+
+        Args:
+            ocr_texts: Raw OCR texts, one per receipt
+            max_concurrency: Maximum number of in-flight API requests
+            requests_per_minute: Optional cap on request start rate, to stay
+                within the account's rate limits
+
+        Returns:
+            Results in the same order as ocr_texts. Failed extractions are
+            returned as the raised exception instead of an ExtractionResult.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        rate_lock = asyncio.Lock()
+        next_start = 0.0
+
+        async def wait_for_rate_limit() -> None:
+            nonlocal next_start
+            async with rate_lock:
+                loop = asyncio.get_running_loop()
+                delay = next_start - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                next_start = loop.time() + interval
+
+        async def extract_one(ocr_text: str) -> ExtractionResult:
+            async with semaphore:
+                if interval:
+                    await wait_for_rate_limit()
+                return await self.extract_receipt_data(ocr_text)
+
+        return await asyncio.gather(
+            *(extract_one(ocr_text) for ocr_text in ocr_texts),
+            return_exceptions=True,
+        )
+
+    async def extract_receipts_batch(
+        self, ocr_texts: list[str]
+    ) -> list[ExtractionResult | Exception]:
+        """
+        Extract structured receipt data through the Message Batches API.
+
+        All uncached texts are submitted as one batch, which is billed at a
+        discount and not subject to per-minute request limits, but may take
+        minutes to complete. The batch is polled with exponential backoff
+        until it ends. Responses are requested as JSON via the system prompt
+        and validated against the Receipt model.
+
+        Args:
+            ocr_texts: Raw OCR texts, one per receipt
+
+        Returns:
+            Results in the same order as ocr_texts. Failed extractions are
+            returned as an ExtractionError instead of an ExtractionResult.
+
+        Raises:
+            anthropic.APIError: If the batch cannot be created or polled
+        """
+        start_time = time.time()
+        results: list[ExtractionResult | Exception] = [
+            ExtractionError("No result returned for batch request")
+        ] * len(ocr_texts)
+
+        # Serve cached inputs directly; only submit the misses
+        requests = []
+        for idx, ocr_text in enumerate(ocr_texts):
+            cached_result = self._cached_result(ocr_text, start_time)
+            if cached_result is not None:
+                results[idx] = cached_result
+                continue
+
+            system_prompt, user_prompt = self._render_prompts(ocr_text)
+            requests.append(
+                {
+                    "custom_id": str(idx),
+                    "params": {
+                        "model": self.model,
+                        "max_tokens": self.max_tokens,
+                        "temperature": self.temperature,
+                        "system": [{"type": "text", "text": system_prompt}],
+                        "messages": [
+                            {"role": "user", "content": self._user_content(user_prompt)}
+                        ],
+                    },
+                }
+            )
+
+        if not requests:
+            return results
+
+        batch = await self.client.messages.batches.create(requests=requests)
+
+        delay = BATCH_POLL_INITIAL_DELAY
+        while batch.processing_status != "ended":
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX_DELAY)
+            batch = await self.client.messages.batches.retrieve(batch.id)
+
+        processing_time = time.time() - start_time
+        async for entry in await self.client.messages.batches.results(batch.id):
+            idx = int(entry.custom_id)
+            outcome = entry.result
+            if outcome.type != "succeeded":
+                results[idx] = ExtractionError(f"Batch request {outcome.type}")
+                continue
+
+            message = outcome.message
+            if message.stop_reason == "refusal":
+                results[idx] = ExtractionRefusedError(
+                    "Model refused to process the request"
+                )
+                continue
+            if message.stop_reason == "max_tokens":
+                results[idx] = ExtractionIncompleteError(
+                    "Response truncated due to token limit. Try increasing max_tokens."
+                )
+                continue
+
+            text = "".join(
+                block.text for block in message.content if block.type == "text"
+            )
+            try:
+                receipt = Receipt.model_validate_json(text)
+            except ValidationError as e:
+                results[idx] = ExtractionError(
+                    f"Response did not match the required schema: {e}"
+                )
+                continue
+
+            if self.cache_dir:
+                self._store_cached(self._cache_key(ocr_texts[idx]), receipt)
+
+            results[idx] = ExtractionResult(
+                receipt=receipt,
+                input_tokens=message.usage.input_tokens,
+                output_tokens=message.usage.output_tokens,
+                cache_creation_input_tokens=message.usage.cache_creation_input_tokens,
+                cache_read_input_tokens=message.usage.cache_read_input_tokens,
+                processing_time=processing_time,
+            )
+
+        return results
+
+    async def extract_receipts_packed(
+        self,
+        ocr_texts: list[str],
+        batch_size: int = PACKED_BATCH_SIZE,
+        max_concurrency: int = 10,
+    ) -> list[ExtractionResult | Exception]:
+        """
+        Extract several receipts per API request.
+
+        Texts are packed batch_size at a time into a single request, each in
+        its own <receipt> element, and the model returns one Receipt per
+        element. This cuts the request count to ceil(N / batch_size) and
+        sends the shared instructions once per request. Chunks run
+        concurrently, and transient API errors are retried like in
+        extract_receipt_data. A packed request's output cap is the sum of its
+        receipts' caps, clamped to PACKED_MAX_OUTPUT_TOKENS. If a chunk's
+        response is truncated, fails validation, or has the wrong number of
+        receipts, that chunk falls back to extract_receipt_data per receipt.
+        If a chunk's request still fails, each of its receipts gets the error;
+        other chunks are unaffected.
+
+        Args:
+            ocr_texts: Raw OCR texts, one per receipt
+            batch_size: Maximum number of receipts per request
+            max_concurrency: Maximum number of in-flight API requests, shared
+                by packed requests and any per-receipt fallbacks
+
+        Returns:
+            Results in the same order as ocr_texts. Failed extractions are
+            returned as the raised exception instead of an ExtractionResult.
+            Token usage of a packed request is split evenly across its
+            receipts.
+        """
+        start_time = time.time()
+        results: list[ExtractionResult | Exception | None] = [
+            self._cached_result(ocr_text, start_time) for ocr_text in ocr_texts
+        ]
+
+        # Pack only the cache misses
+        pending = [idx for idx, result in enumerate(results) if result is None]
+        chunks = [
+            pending[i : i + batch_size] for i in range(0, len(pending), batch_size)
+        ]
+        semaphore = asyncio.Semaphore(max_concurrency)
+        chunk_results = await asyncio.gather(
+            *(
+                self._extract_packed_chunk([ocr_texts[idx] for idx in chunk], semaphore)
+                for chunk in chunks
+            ),
+            return_exceptions=True,
+        )
+        for chunk, chunk_result in zip(chunks, chunk_results, strict=True):
+            if isinstance(chunk_result, BaseException):
+                # A failed chunk fails each of its receipts, not the whole call
+                chunk_result = [chunk_result] * len(chunk)
+            for idx, result in zip(chunk, chunk_result, strict=True):
+                results[idx] = result
+
+        return results  # type: ignore[return-value]
+
+    async def _extract_each(
+        self, ocr_texts: list[str], semaphore: asyncio.Semaphore
+    ) -> list[ExtractionResult | Exception]:
+        """
+        Extract receipts one request each, within a shared concurrency limit.
+
+        Args:
+            ocr_texts: Raw OCR texts, one per receipt
+            semaphore: Limit on in-flight API requests
+
+        Returns:
+            Per-receipt results or exceptions, in input order
+        """
+
+        async def extract_one(ocr_text: str) -> ExtractionResult:
+            async with semaphore:
+                return await self.extract_receipt_data(ocr_text)
+
+        return await asyncio.gather(
+            *(extract_one(ocr_text) for ocr_text in ocr_texts),
+            return_exceptions=True,
+        )
+
+    async def _extract_packed_chunk(
+        self, ocr_texts: list[str], semaphore: asyncio.Semaphore
+    ) -> list[ExtractionResult | Exception]:
+        """
+        Extract one chunk of receipts in a single request.
+
+        Args:
+            ocr_texts: Raw OCR texts, at most one packed batch
+            semaphore: Limit on in-flight API requests, held per request
+
+        Returns:
+            Per-receipt results or exceptions, in input order
+        """
+        if len(ocr_texts) == 1:
+            return await self._extract_each(ocr_texts, semaphore)
+
+        start_time = time.time()
+        user_prompt = self.jinja_env.get_template(
+            "extractor_user_packed.jinja2"
+        ).render(OCR_TEXTS=ocr_texts)
+        messages: list[BetaMessageParam] = [
+            {"role": "user", "content": self._user_content(user_prompt)}
+        ]
+        budget = min(
+            sum(self._output_token_budget(ocr_text) for ocr_text in ocr_texts),
+            PACKED_MAX_OUTPUT_TOKENS,
+        )
+
+        try:
+            async with semaphore:
+                response = await self._parse_packed(messages, budget)
+        except ValidationError:
+            response = None
+        except (APIConnectionError, APIStatusError) as e:
+            # Retries are exhausted or the error is not transient; re-sending
+            # each receipt on its own would only add load, so fail the chunk
+            return [e for _ in ocr_texts]
+
+        if response is not None and response.stop_reason == "refusal":
+            return [
+                ExtractionRefusedError("Model refused to process the request")
+                for _ in ocr_texts
+            ]
+
+        batch: _ReceiptBatch | None = response.parsed_output if response else None
+        if (
+            response is None
+            or response.stop_reason == "max_tokens"
+            or batch is None
+            or len(batch.receipts) != len(ocr_texts)
+        ):
+            # Fall back to one request per receipt for this chunk
+            return await self._extract_each(ocr_texts, semaphore)
+
+        count = len(ocr_texts)
+        usage = response.usage
+        processing_time = time.time() - start_time
+        results: list[ExtractionResult | Exception] = []
+        for ocr_text, receipt in zip(ocr_texts, batch.receipts, strict=True):
+            if self.cache_dir:
+                self._store_cached(self._cache_key(ocr_text), receipt)
+            results.append(
+                ExtractionResult(
+                    receipt=receipt,
+                    input_tokens=usage.input_tokens // count,
+                    output_tokens=usage.output_tokens // count,
+                    cache_creation_input_tokens=(
+                        (usage.cache_creation_input_tokens or 0) // count
+                    ),
+                    cache_read_input_tokens=(usage.cache_read_input_tokens or 0)
+                    // count,
+                    processing_time=processing_time,
+                )
+            )
+        return results
@@ -7,29 +7,81 @@ suppress these warnings where appropriate.
 """
 
 import io
+import os
+import queue
+import shutil
 import threading
 from collections.abc import Generator
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
+from typing import BinaryIO
 
+import google.auth
+from google.auth.credentials import Credentials
+from google.auth.transport.requests import AuthorizedSession, Request
 from googleapiclient.discovery import Resource, build
 from googleapiclient.http import MediaIoBaseDownload
-from pydantic import BaseModel, ConfigDict, Field
-
-# Thread-local storage for Google API services to avoid redundant build() calls
-# while maintaining thread safety for httplib2.Http objects.
-_thread_local = threading.local()
-
-
-def _get_thread_service() -> Resource:
-    """Get or create a thread-local Drive service.
-
-    This avoids the heavy overhead of calling build() for every file,
-    while ensuring each thread has its own Http object.
+from requests.adapters import HTTPAdapter
+
+DRIVE_READONLY_SCOPE = "https://www.googleapis.com/auth/drive.readonly"
+DRIVE_MEDIA_URL = "https://www.googleapis.com/drive/v3/files/{file_id}?alt=media"
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+# (connect, read) timeouts in seconds for media downloads, so a stalled
+# connection fails the file instead of blocking a pool thread forever
+DOWNLOAD_TIMEOUT = (10, 60)
+LIST_PAGE_SIZE = 1000  # Maximum page size accepted by files.list
+
+SESSION_POOL_SIZE = 32  # Connections kept alive for concurrent downloads
+
+# Credentials and the authorized HTTP session are shared by the whole process.
+# One session means one connection pool, so TCP/TLS connections stay warm
+# across files and threads, and one credentials object means a single token
+# refresh instead of one per worker thread.
+_credentials: Credentials | None = None
+_credentials_lock = threading.Lock()
+_session: AuthorizedSession | None = None
+_session_lock = threading.Lock()
+
+
+def _get_credentials() -> Credentials:
+    """Get the process-wide Application Default Credentials for Drive."""
+    global _credentials
+    if _credentials is None:
+        with _credentials_lock:
+            if _credentials is None:
+                _credentials, _ = google.auth.default(scopes=[DRIVE_READONLY_SCOPE])
+    return _credentials
+
+
+def _refresh_credentials() -> Credentials:
+    """Return the shared credentials, refreshing the token if needed.
+
+    The refresh is serialized so concurrent downloads hitting an expired token
+    trigger a single OAuth round-trip rather than a stampede.
     """
-    if not hasattr(_thread_local, "drive_service"):
-        _thread_local.drive_service = build("drive", "v3")
-    return _thread_local.drive_service
+    credentials = _get_credentials()
+    if not credentials.valid:
+        with _credentials_lock:
+            if not credentials.valid:
+                credentials.refresh(Request())
+    return credentials
+
+
+def _get_session() -> AuthorizedSession:
+    """Get or create the process-wide authorized HTTP session."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = AuthorizedSession(_get_credentials())
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=SESSION_POOL_SIZE
+                )
+                session.mount("https://", adapter)
+                _session = session
+    return _session
 
 
 def generate_file_url(file_id: str | None) -> str:
@@ -46,9 +98,13 @@ def generate_file_url(file_id: str | None) -> str:
     return f"https://drive.google.com/file/d/{file_id}/view"
 
 
-class DownloadResult(BaseModel):
+@dataclass(frozen=True, slots=True)
+class DownloadResult:
     """Result from downloading a single file.
 
+    A plain frozen dataclass rather than a Pydantic model: it is built once
+    per file from trusted internal data, so validation would be pure overhead.
+
     Attributes:
         success: Whether the download succeeded
         file_id: The Google Drive file ID
@@ -56,23 +112,43 @@ class DownloadResult(BaseModel):
         error: Error message (only present if success=False)
     """
 
-    model_config = ConfigDict(frozen=True)  # Make immutable for safety
+    success: bool
+    file_id: str
+    dest_path: Path
+    error: str | None = None
+
 
-    success: bool = Field(..., description="Whether the download succeeded")
-    file_id: str = Field(..., description="The Google Drive file ID")
-    dest_path: Path = Field(..., description="Local path where file was downloaded")
-    error: str | None = Field(
-        None, description="Error message (only present if success=False)"
-    )
+def _open_for_download(dest_path: Path, size: int | None) -> io.BufferedWriter:
+    """Open a destination file for writing, preallocating it when possible.
+
+    Preallocating the full size up front (when Drive reports it) lets the
+    filesystem lay the file out in one contiguous extent instead of growing
+    it chunk by chunk. Filesystems without fallocate support are tolerated.
+
+    Args:
+        dest_path: Local path to write
+        size: Expected file size in bytes, or None if unknown
+
+    Returns:
+        A buffered binary writer for the file
+    """
+    fd = os.open(dest_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    if size and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except OSError:
+            pass  # Not supported by this filesystem; fall back to growing
+    return os.fdopen(fd, "wb", buffering=DOWNLOAD_CHUNK_SIZE)
 
 
 def download_single_file(file_info: dict, dest_dir: Path) -> DownloadResult:
     """Helper function to download a single file and return a result.
 
-    Creates a thread-local service object to avoid SSL/threading issues.
+    Streams the file body from the Drive media endpoint in a single GET over
+    the shared pooled session.
 
     Args:
-        file_info: Dictionary with 'id' and 'name' keys
+        file_info: Dictionary with 'id' and 'name' keys, and optionally 'size'
         dest_dir: Destination directory path
 
     Returns:
@@ -81,18 +157,19 @@ def download_single_file(file_info: dict, dest_dir: Path) -> DownloadResult:
     file_id = file_info["id"]
     file_name = file_info["name"]
     dest_path = dest_dir / file_name
+    size = int(file_info["size"]) if file_info.get("size") else None
 
     try:
-        # Use a thread-local service to avoid heavy discovery calls
-        # while maintaining thread safety
-        thread_service = _get_thread_service()
-        # Note: files() is dynamically added by googleapiclient at runtime
-        request = thread_service.files().get_media(fileId=file_id)  # type: ignore[attr-defined]
-        with io.FileIO(str(dest_path), "wb") as fh:
-            downloader = MediaIoBaseDownload(fh, request)
-            done = False
-            while done is False:
-                status, done = downloader.next_chunk()
+        _refresh_credentials()
+        session = _get_session()
+        url = DRIVE_MEDIA_URL.format(file_id=file_id)
+        with session.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            with _open_for_download(dest_path, size) as fh:
+                shutil.copyfileobj(response.raw, fh, DOWNLOAD_CHUNK_SIZE)
+                # Drop any preallocated tail if the body was shorter than size
+                fh.truncate()
 
         return DownloadResult(
             success=True,
@@ -109,24 +186,42 @@ def download_single_file(file_info: dict, dest_dir: Path) -> DownloadResult:
         )
 
 
+def _download_media(fh: BinaryIO, request) -> None:
+    """Drive a chunked media download into an open binary file object.
+
+    Args:
+        fh: Writable binary file object
+        request: Media request from files().get_media()
+    """
+    downloader = MediaIoBaseDownload(fh, request)
+    done = False
+    while done is False:
+        _status, done = downloader.next_chunk()
+
+
 class GDriveClient:
     def __init__(self, max_workers: int = 4):
-        self._service: Resource | None = None  # Private cache for lazy initialization
         self.max_workers = max_workers
 
-    @property
+    @cached_property
     def service(self) -> Resource:
         """Lazily initialize and return the Google Drive service.
 
         The service is created on first access and cached for subsequent calls.
-        This avoids gRPC initialization overhead during instantiation.
+        This avoids gRPC initialization overhead during instantiation. The
+        discovery document is the static copy bundled with googleapiclient and
+        the credentials are the process-wide ones shared with downloads, so
+        building a service needs no network round-trip or ADC lookup.
 
         Returns:
             The Google Drive API service (Resource object)
         """
-        if self._service is None:
-            self._service = build("drive", "v3")
-        return self._service
+        return build(
+            "drive",
+            "v3",
+            credentials=_get_credentials(),
+            static_discovery=True,
+        )
 
     def list_files(self, folder_id, mime_types=None):
         query = f"'{folder_id}' in parents"
@@ -134,22 +229,44 @@ class GDriveClient:
             mime_query = " or ".join([f"mimeType='{m}'" for m in mime_types])
             query += f" and ({mime_query})"
 
-        # Note: files() is dynamically added by googleapiclient at runtime
-        results = (
-            self.service.files()  # type: ignore[attr-defined]
-            .list(q=query, fields="files(id, name, mimeType)")
-            .execute()
-        )
-        return results.get("files", [])
+        # Page through results with the largest page size Drive allows, so
+        # large folders are neither truncated nor split into many requests
+        files: list[dict] = []
+        page_token = None
+        while True:
+            # Note: files() is dynamically added by googleapiclient at runtime
+            results = (
+                self.service.files()  # type: ignore[attr-defined]
+                .list(
+                    q=query,
+                    fields="nextPageToken, files(id, name, mimeType, size)",
+                    pageSize=LIST_PAGE_SIZE,
+                    pageToken=page_token,
+                )
+                .execute()
+            )
+            files.extend(results.get("files", []))
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                return files
+
+    def download_file(self, file_id: str, dest: str | Path | BinaryIO) -> None:
+        """Download a file's content to a local path or a binary stream.
+
+        Passing a stream such as io.BytesIO keeps the content in memory, so
+        it can be handed to OCR without a disk round-trip.
 
-    def download_file(self, file_id, dest_path):
+        Args:
+            file_id: Google Drive file ID
+            dest: Destination file path, or a writable binary file object
+        """
         # Note: files() is dynamically added by googleapiclient at runtime
         request = self.service.files().get_media(fileId=file_id)  # type: ignore[attr-defined]
-        with io.FileIO(dest_path, "wb") as fh:
-            downloader = MediaIoBaseDownload(fh, request)
-            done = False
-            while done is False:
-                status, done = downloader.next_chunk()
+        if isinstance(dest, str | Path):
+            with io.FileIO(dest, "wb") as fh:
+                _download_media(fh, request)
+        else:
+            _download_media(dest, request)
 
     def download_files(
         self, files: list[dict], dest_dir: Path
@@ -158,7 +275,8 @@ class GDriveClient:
 
         This generator yields download results as soon as each file finishes
         downloading, enabling downstream processing to start immediately
-        without waiting for all downloads to complete.
+        without waiting for all downloads to complete. Submission is bounded
+        to twice max_workers, so huge folders do not queue a future per file.
 
         Args:
             files: List of file dictionaries with 'id' and 'name' keys
@@ -171,13 +289,24 @@ class GDriveClient:
                 - dest_path: path where a file was downloaded
                 - error: error message (only if success=False)
         """
+        # Completed futures are pushed here by their done-callbacks, so the
+        # generator wakes exactly once per finished download
+        completed: queue.SimpleQueue[Future[DownloadResult]] = queue.SimpleQueue()
+        # Keep at most this many downloads submitted but not yet yielded,
+        # bounding memory to O(max_workers) instead of O(len(files))
+        max_pending = 2 * self.max_workers
+        pending = 0
+
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all download tasks
-            future_to_file = {
-                executor.submit(download_single_file, file_info, dest_dir): file_info
-                for file_info in files
-            }
-
-            # Yield results as they complete (streaming)
-            for future in as_completed(future_to_file):
-                yield future.result()
+            for file_info in files:
+                if pending >= max_pending:
+                    yield completed.get().result()
+                    pending -= 1
+                future = executor.submit(download_single_file, file_info, dest_dir)
+                future.add_done_callback(completed.put)
+                pending += 1
+
+            # Yield the remaining results as they complete (streaming)
+            while pending:
+                yield completed.get().result()
+                pending -= 1
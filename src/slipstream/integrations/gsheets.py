@@ -6,27 +6,37 @@ so type checkers can't detect them. We use # type: ignore[attr-defined] to
 suppress these warnings where appropriate.
 """
 
+import threading
+import time
+from functools import cached_property
 from typing import Any
 
 from googleapiclient.discovery import Resource, build
 from googleapiclient.errors import HttpError
 from tenacity import (
+    RetryCallState,
     retry,
     retry_if_exception,
     stop_after_attempt,
-    wait_exponential,
+    wait_exponential_jitter,
 )
 
 from slipstream.integrations.gdrive import generate_file_url
 from slipstream.models import Receipt
 
+# HTTP statuses worth retrying: rate limiting and transient server errors
+_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Network-level failures worth retrying
+_NETWORK_ERRORS = (ConnectionError, TimeoutError, OSError)
+
 
 def _is_retryable_error(exception: BaseException) -> bool:
     """Determine if an exception should trigger a retry.
 
     Retries on:
     - HTTP 429 (rate limit exceeded)
-    - HTTP 503 (service unavailable)
+    - HTTP 500, 502, 503, 504 (transient server errors)
     - Network errors (ConnectionError, TimeoutError, etc.)
 
     Does NOT retry on:
@@ -41,17 +51,52 @@ def _is_retryable_error(exception: BaseException) -> bool:
     Returns:
         True if the exception is retryable, False otherwise
     """
-    # Retry on network errors
-    if isinstance(exception, ConnectionError | TimeoutError | OSError):
-        return True
-
-    # Retry on specific HTTP errors
+    # HTTP errors are the common case (rate limiting), so check them first
     if isinstance(exception, HttpError):
-        status = exception.resp.status
-        # Retry on rate limit (429) and service unavailable (503)
-        return status in (429, 503)
+        return exception.resp.status in _RETRYABLE_STATUSES
+
+    return isinstance(exception, _NETWORK_ERRORS)
+
+
+# Upper bound (seconds) on any single wait between Sheets retries
+MAX_RETRY_WAIT = 60.0
+
+_backoff_wait = wait_exponential_jitter(initial=1, max=MAX_RETRY_WAIT)
 
-    return False
+
+def _wait_for_retry(retry_state: RetryCallState) -> float:
+    """Compute how long to wait before the next Sheets API attempt.
+
+    For HTTP 429 responses carrying a Retry-After header, waits exactly the
+    server-indicated number of seconds, since the per-minute quota refills on
+    the server's schedule. Otherwise falls back to jittered exponential
+    backoff.
+
+    Args:
+        retry_state: Tenacity state for the call being retried
+
+    Returns:
+        Seconds to wait, never more than MAX_RETRY_WAIT
+    """
+    exception = retry_state.outcome.exception() if retry_state.outcome else None
+    if isinstance(exception, HttpError) and exception.resp.status == 429:
+        try:
+            retry_after = float(exception.resp.get("retry-after"))
+        except (TypeError, ValueError):
+            pass
+        else:
+            return min(max(retry_after, 0.0), MAX_RETRY_WAIT)
+
+    return _backoff_wait(retry_state)
+
+
+# Shared retry policy for Sheets API writes
+_SHEETS_RETRY = retry(
+    retry=retry_if_exception(_is_retryable_error),
+    stop=stop_after_attempt(5),
+    wait=_wait_for_retry,
+    reraise=True,
+)
 
 
 def receipt_to_sheet_row(receipt: Receipt) -> list[Any]:
@@ -79,6 +124,25 @@ def receipt_to_sheet_row(receipt: Receipt) -> list[Any]:
     ]
 
 
+def receipts_to_rows(receipts: list[Receipt]) -> list[list[Any]]:
+    """Convert many Receipt models to Google Sheets rows in one pass.
+
+    Equivalent to calling receipt_to_sheet_row on each receipt, without the
+    per-receipt function call overhead.
+
+    Args:
+        receipts: The Receipt objects to convert
+
+    Returns:
+        One 5-value row per receipt, in the same order
+    """
+    file_url = generate_file_url
+    return [
+        [r.merchant_name, r.date, r.currency, r.total_amount, file_url(r.file_id)]
+        for r in receipts
+    ]
+
+
 class GSheetsClient:
     """Client for interacting with Google Sheets API.
 
@@ -92,29 +156,28 @@ class GSheetsClient:
         Args:
             spreadsheet_id: Optional Google Sheets spreadsheet ID
         """
-        self._service: Resource | None = None  # Private cache for lazy initialization
         self.spreadsheet_id = spreadsheet_id
 
-    @property
+        # Rows waiting to be written by append_rows_buffered
+        self._buffer: list[list[Any]] = []
+        self._buffer_started: float | None = None
+        self._buffer_lock = threading.Lock()
+
+    @cached_property
     def service(self) -> Resource:
         """Lazily initialize and return the Google Sheets service.
 
         The service is created on first access and cached for subsequent calls.
-        This avoids gRPC initialization overhead during instantiation.
+        This avoids gRPC initialization overhead during instantiation. The
+        discovery document is the static copy bundled with googleapiclient,
+        so building the service never fetches it over the network.
 
         Returns:
             The Google Sheets API service (Resource object)
         """
-        if self._service is None:
-            self._service = build("sheets", "v4")
-        return self._service
-
-    @retry(
-        retry=retry_if_exception(_is_retryable_error),
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        reraise=True,
-    )
+        return build("sheets", "v4", static_discovery=True)
+
+    @_SHEETS_RETRY
     def append_row(
         self, values: list[Any], range_name: str = "Sheet1!A1"
     ) -> dict[str, Any]:
@@ -148,12 +211,7 @@ class GSheetsClient:
         )
         return result
 
-    @retry(
-        retry=retry_if_exception(_is_retryable_error),
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        reraise=True,
-    )
+    @_SHEETS_RETRY
     def append_rows(
         self, rows: list[list[Any]], range_name: str = "Sheet1!A1"
     ) -> dict[str, Any]:
@@ -186,3 +244,71 @@ class GSheetsClient:
             .execute()
         )
         return result
+
+    def append_rows_buffered(
+        self,
+        rows: list[list[Any]],
+        max_batch: int = 500,
+        max_age_s: float = 5.0,
+        range_name: str = "Sheet1!A1",
+    ) -> dict[str, Any] | None:
+        """Buffer rows and append them in coalesced batches.
+
+        Rows are held until at least max_batch rows are buffered or the oldest
+        buffered row is max_age_s seconds old, then written with a single
+        append_rows call. This keeps frequent small writes within the Sheets
+        API's per-minute write quota. Call flush() once done to write any
+        remaining rows.
+
+        Args:
+            rows: List of rows, where each row is a list of values
+            max_batch: Flush once this many rows are buffered
+            max_age_s: Flush once the oldest buffered row is this old
+            range_name: The A1 notation of the range to append to (default: "Sheet1!A1")
+
+        Returns:
+            The API response if the buffer was flushed, otherwise None
+
+        Raises:
+            ValueError: If spreadsheet_id is not set
+            HttpError: For non-retryable errors or after max retries
+        """
+        with self._buffer_lock:
+            if not self._buffer:
+                self._buffer_started = time.monotonic()
+            self._buffer.extend(rows)
+            is_full = len(self._buffer) >= max_batch
+            is_stale = time.monotonic() - self._buffer_started >= max_age_s  # type: ignore[operator]
+
+        if is_full or is_stale:
+            return self.flush(range_name)
+        return None
+
+    def flush(self, range_name: str = "Sheet1!A1") -> dict[str, Any] | None:
+        """Write all rows buffered by append_rows_buffered.
+
+        Args:
+            range_name: The A1 notation of the range to append to (default: "Sheet1!A1")
+
+        Returns:
+            The API response, or None if the buffer was empty
+
+        Raises:
+            ValueError: If spreadsheet_id is not set
+            HttpError: For non-retryable errors or after max retries. The
+                rows stay buffered, so a later flush() writes them again.
+        """
+        with self._buffer_lock:
+            rows, self._buffer = self._buffer, []
+            started, self._buffer_started = self._buffer_started, None
+
+        if not rows:
+            return None
+        try:
+            return self.append_rows(rows, range_name)
+        except Exception:
+            # Put the rows back ahead of any buffered since, keeping row order
+            with self._buffer_lock:
+                self._buffer[:0] = rows
+                self._buffer_started = started
+            raise
@@ -2,15 +2,21 @@
 
 import csv
 import fcntl
+import io
 import os
+import threading
 from pathlib import Path
 
-from slipstream.integrations.gsheets import receipt_to_sheet_row
+from slipstream.integrations.gsheets import receipts_to_rows
 from slipstream.models import Receipt
 
 # CSV header matching Google Sheets format
 CSV_HEADER = ["商家", "日期", "幣別", "總計", "圖片連結"]
 
+# Serializes exports within this process, so threads queue on a cheap
+# in-memory lock rather than contending for the kernel file lock
+_CSV_LOCK = threading.Lock()
+
 
 class LocalExporter:
     """Exporter for writing receipt data to local CSV files.
@@ -42,9 +48,12 @@ class LocalExporter:
         path.parent.mkdir(parents=True, exist_ok=True)
 
         # Always use utf-8 encoding and manually write BOM when creating new file
-        # This avoids BOM appearing in the middle when appending
-        with open(path, mode="a", encoding="utf-8", newline="") as f:
-            # Use file locking to prevent corruption from concurrent writes
+        # This avoids BOM appearing in the middle when appending. The flock is
+        # still taken once per export for safety across processes, since the
+        # single write may exceed PIPE_BUF; for high fan-out across processes,
+        # prefer a separate file per worker.
+        with _CSV_LOCK, open(path, mode="a", encoding="utf-8", newline="") as f:
+            # Use file locking to prevent corruption from concurrent processes
             fcntl.flock(f.fileno(), fcntl.LOCK_EX)
             try:
                 # Check actual file size AFTER acquiring lock using fstat
@@ -52,20 +61,23 @@ class LocalExporter:
                 file_stat = os.fstat(f.fileno())
                 is_new_file = file_stat.st_size == 0
 
+                # Build the whole payload in memory so it lands in one write()
+                buffer = io.StringIO()
+
                 # For new files, write BOM first for Excel compatibility
                 if is_new_file:
-                    f.write("\ufeff")  # UTF-8 BOM
+                    buffer.write("\ufeff")  # UTF-8 BOM
 
-                writer = csv.writer(f)
+                writer = csv.writer(buffer)
 
                 # Write header only if file is new or empty
                 if is_new_file:
                     writer.writerow(CSV_HEADER)
 
                 # Write receipt data rows
-                for receipt in receipts:
-                    row = receipt_to_sheet_row(receipt)
-                    writer.writerow(row)
+                writer.writerows(receipts_to_rows(receipts))
+
+                f.write(buffer.getvalue())
 
                 # Flush to ensure data is written before releasing lock
                 f.flush()
@@ -1,8 +1,13 @@
 import asyncio
+import contextlib
+import json
 import os
 import tempfile
-from collections.abc import Callable, Generator
+from collections.abc import AsyncIterator, Callable, Generator, Iterable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from enum import StrEnum
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
 from dotenv import load_dotenv
@@ -13,24 +18,38 @@ from dotenv import load_dotenv
 os.environ.setdefault("GRPC_ENABLE_FORK_SUPPORT", "0")
 
 from slipstream import __version__
-from slipstream.integrations.anthropic_extractor import (
-    AnthropicExtractor,
-    ExtractionError,
-    ExtractionIncompleteError,
-    ExtractionRefusedError,
-)
+
+# Unlike the Anthropic SDK below, the Drive client stays a top-level import:
+# the Google auth and API client stack it needs is already loaded by the OCR
+# and Sheets imports, so deferring it would not make --help any faster
 from slipstream.integrations.gdrive import DownloadResult, GDriveClient
-from slipstream.integrations.gsheets import GSheetsClient, receipt_to_sheet_row
+from slipstream.integrations.gsheets import GSheetsClient, receipts_to_rows
 from slipstream.integrations.local_export import LocalExporter
 from slipstream.integrations.ocr import OCREngine
 from slipstream.models import ProcessingResult
 from slipstream.utils.url_parser import URLParserError, parse_google_id
 
-load_dotenv()
+# The Anthropic SDK takes most of the CLI's import time, so it is only
+# imported once process actually needs an extractor (not for --help)
+if TYPE_CHECKING:
+    from slipstream.integrations.anthropic_extractor import AnthropicExtractor
+
+# uvloop is an optional, faster drop-in event loop (not available on Windows)
+try:
+    from uvloop import run as _run_event_loop
+except ImportError:
+    from asyncio import run as _run_event_loop
 
 app = typer.Typer(no_args_is_help=True)
 
 
+class LogFormat(StrEnum):
+    """Output format for per-file progress events."""
+
+    TEXT = "text"
+    JSON = "json"
+
+
 def version_callback(value: bool):
     if value:
         typer.echo(f"slipstream version: {__version__}")
@@ -45,15 +64,112 @@ def callback(
     ),
 ):
     """Slipstream CLI tool."""
+    # Load .env here rather than at import time, so importing the app (e.g.
+    # from tests) does not search the filesystem for .env files
+    load_dotenv()
     if ctx.invoked_subcommand is None:
         typer.echo(ctx.get_help())
 
 
+async def _iterate_in_thread[T](iterable: Iterable[T]) -> AsyncIterator[T]:
+    """Consume a blocking iterable in a worker thread, yielding items async.
+
+    Items are handed to the event loop through an asyncio.Queue as soon as the
+    worker produces them, so the loop stays free to run other tasks while the
+    iterable blocks (e.g. while waiting for the next download to finish).
+
+    Args:
+        iterable: Blocking iterable to consume
+
+    Yields:
+        Items from the iterable, in order
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[tuple[bool, T | None]] = asyncio.Queue()
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                loop.call_soon_threadsafe(queue.put_nowait, (False, item))
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, (True, None))
+
+    producer = loop.run_in_executor(None, produce)
+    while True:
+        done, item = await queue.get()
+        if done:
+            break
+        yield item  # type: ignore[misc]
+
+    # Surface any exception raised by the iterable
+    await producer
+
+
+class _BatchedProgress:
+    """Progress callback that prints events in batches from a background task.
+
+    Calling the instance only enqueues the event, so pipeline tasks never
+    block on terminal output. run() drains the queue, writing up to
+    max_batch events per echo call.
+    """
+
+    def __init__(
+        self, max_batch: int = 64, log_format: LogFormat = LogFormat.TEXT
+    ) -> None:
+        """
+        Initialize the batched progress printer.
+
+        Args:
+            max_batch: Maximum number of events written per echo call
+            log_format: TEXT prints each message as is; JSON prints one
+                {"event": ..., "message": ...} object per line
+        """
+        self.max_batch = max_batch
+        self.log_format = log_format
+        self._queue: asyncio.Queue[tuple[str, str] | None] = asyncio.Queue()
+
+    def __call__(self, event_type: str, message: str) -> None:
+        """Enqueue a progress event (event_type, message) for printing."""
+        self._queue.put_nowait((event_type, message))
+
+    def close(self) -> None:
+        """Signal run() to exit once all queued events are printed."""
+        self._queue.put_nowait(None)
+
+    async def run(self) -> None:
+        """Print queued events in batches until close() is called."""
+        done = False
+        while not done:
+            items = [await self._queue.get()]
+            while len(items) < self.max_batch and not self._queue.empty():
+                items.append(self._queue.get_nowait())
+
+            output: list[str] = []
+            errors: list[str] = []
+            for item in items:
+                if item is None:
+                    done = True
+                    continue
+                event_type, message = item
+                if self.log_format is LogFormat.JSON:
+                    message = json.dumps(
+                        {"event": event_type, "message": message}, ensure_ascii=False
+                    )
+                (errors if "error" in event_type else output).append(message)
+
+            if output:
+                typer.echo("\n".join(output))
+            if errors:
+                typer.echo("\n".join(errors), err=True)
+
+
 async def process_downloaded_file(
     download_result: DownloadResult,
     ocr_engine: OCREngine,
-    extractor: AnthropicExtractor | None,
+    extractor: "AnthropicExtractor | None",
     on_progress: Callable[[str, str], None] | None = None,
+    ocr_executor: Executor | None = None,
+    ocr_semaphore: asyncio.Semaphore | None = None,
 ) -> ProcessingResult:
     """Process a single downloaded file through OCR and LLM extraction.
 
@@ -62,6 +178,9 @@ async def process_downloaded_file(
         ocr_engine: OCR engine for text extraction
         extractor: Anthropic extractor for structured data extraction (optional)
         on_progress: Optional callback for progress updates (event_type, message)
+        ocr_executor: Executor to run OCR in (default: the loop's default
+            executor)
+        ocr_semaphore: Optional semaphore bounding concurrent OCR calls
 
     Returns:
         ProcessingResult with OCR text, extraction results, and any errors
@@ -84,9 +203,15 @@ async def process_downloaded_file(
 
     # Step 1: OCR extraction
     try:
-        # OCR is synchronous, so we run it in an executor for true parallelism
-        loop = asyncio.get_event_loop()
-        text = await loop.run_in_executor(None, ocr_engine.extract_text, str(dest_path))
+        # OCR is synchronous, so we run it in a worker thread for true
+        # parallelism, gated by the semaphore when one is given
+        async with ocr_semaphore or contextlib.nullcontext():
+            if ocr_executor is None:
+                text = await asyncio.to_thread(ocr_engine.extract_text, str(dest_path))
+            else:
+                text = await asyncio.get_running_loop().run_in_executor(
+                    ocr_executor, ocr_engine.extract_text, str(dest_path)
+                )
         result.ocr_text = text
 
         message = f"Extracted text from {file_name}: {len(text)} characters"
@@ -117,12 +242,7 @@ async def process_downloaded_file(
             if on_progress:
                 on_progress("llm_success", message)
 
-        except (
-            ExtractionRefusedError,
-            ExtractionIncompleteError,
-            ExtractionError,
-            Exception,
-        ) as e:
+        except Exception as e:  # ExtractionError subclasses and API errors alike
             result.extraction_error = str(e)
             message = f"Failed to extract structured data from {file_name}: {e}"
             if on_progress:
@@ -131,13 +251,64 @@ async def process_downloaded_file(
     return result
 
 
+async def _extract_with_message_batch(
+    results: list[ProcessingResult],
+    extractor: "AnthropicExtractor",
+    on_progress: Callable[[str, str], None] | None = None,
+) -> None:
+    """Extract structured data for all OCR'd files in one Message Batch.
+
+    Args:
+        results: Processing results; those with OCR text are updated in place
+        extractor: Anthropic extractor for structured data extraction
+        on_progress: Optional callback for progress updates (event_type, message)
+    """
+    pending = [result for result in results if result.ocr_text is not None]
+    if not pending:
+        return
+
+    if on_progress:
+        on_progress("llm_batch", f"Submitting {len(pending)} receipts as a batch")
+
+    try:
+        extractions = await extractor.extract_receipts_batch(
+            [result.ocr_text for result in pending]  # type: ignore[misc]
+        )
+    except Exception as e:
+        extractions = [e] * len(pending)
+
+    for result, extraction in zip(pending, extractions, strict=True):
+        if isinstance(extraction, Exception):
+            result.extraction_error = str(extraction)
+            message = (
+                f"Failed to extract structured data from {result.file_name}: "
+                f"{extraction}"
+            )
+            if on_progress:
+                on_progress("llm_error", message)
+            continue
+
+        result.extraction_result = extraction
+        message = (
+            f"Structured data extracted for {result.file_name}: "
+            f"{extraction.receipt.merchant_name}, "
+            f"{extraction.receipt.date}, "
+            f"${extraction.receipt.total_amount:.2f} "
+            f"{extraction.receipt.currency}"
+        )
+        if on_progress:
+            on_progress("llm_success", message)
+
+
 async def run_pipeline(
     download_results: Generator[DownloadResult, None, None],
     ocr_engine: OCREngine,
-    extractor: AnthropicExtractor | None = None,
+    extractor: "AnthropicExtractor | None" = None,
     gsheets_client: GSheetsClient | None = None,
     local_path: Path | None = None,
     on_progress: Callable[[str, str], None] | None = None,
+    batch_extraction: bool = False,
+    workers: int = 4,
 ) -> list[ProcessingResult]:
     """Run the streaming pipeline: process files as they download.
 
@@ -149,34 +320,58 @@ async def run_pipeline(
         gsheets_client: Optional Google Sheets client for writing results
         local_path: Optional path to local CSV file for writing results
         on_progress: Optional callback for progress updates (event_type, message)
+        batch_extraction: Submit all LLM extractions as one Message Batch
+            after OCR finishes, instead of one request per file
+        workers: Maximum number of OCR calls in flight at once. OCR runs in a
+            dedicated thread pool of this size.
 
     Returns:
         List of ProcessingResult objects containing OCR text, LLM extractions,
         and errors
     """
-    # Stream: Start processing each file as soon as it downloads
-    tasks = []
-    for download_result in download_results:
-        # Report download status immediately
-        if download_result.success:
-            message = f"Downloaded {download_result.dest_path.name}"
-            if on_progress:
-                on_progress("download_success", message)
-        else:
-            file_name = download_result.dest_path.name
-            message = f"Failed to download {file_name}: {download_result.error}"
-            if on_progress:
-                on_progress("download_error", message)
+    # In batch mode, files only go through OCR here; extraction happens below
+    file_extractor = None if batch_extraction else extractor
+
+    # Stream: Start processing each file as soon as it downloads. The download
+    # generator blocks, so it is drained in a worker thread to keep the event
+    # loop free for OCR and LLM work on files that have already arrived.
+    ocr_semaphore = asyncio.Semaphore(workers)
+    ocr_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr")
+    try:
+        tasks = []
+        async for download_result in _iterate_in_thread(download_results):
+            # Report download status immediately
+            if download_result.success:
+                message = f"Downloaded {download_result.dest_path.name}"
+                if on_progress:
+                    on_progress("download_success", message)
+            else:
+                file_name = download_result.dest_path.name
+                message = f"Failed to download {file_name}: {download_result.error}"
+                if on_progress:
+                    on_progress("download_error", message)
+
+            # Start processing this file immediately
+            # (don't wait for other downloads)
+            task = asyncio.create_task(
+                process_downloaded_file(
+                    download_result,
+                    ocr_engine,
+                    file_extractor,
+                    on_progress,
+                    ocr_executor=ocr_pool,
+                    ocr_semaphore=ocr_semaphore,
+                )
+            )
+            tasks.append(task)
 
-        # Start processing this file immediately
-        # (don't wait for other downloads)
-        task = asyncio.create_task(
-            process_downloaded_file(download_result, ocr_engine, extractor, on_progress)
-        )
-        tasks.append(task)
+        # Wait for all processing tasks to complete
+        results = await asyncio.gather(*tasks)
+    finally:
+        ocr_pool.shutdown(wait=False, cancel_futures=True)
 
-    # Wait for all processing tasks to complete
-    results = await asyncio.gather(*tasks)
+    if batch_extraction and extractor:
+        await _extract_with_message_batch(results, extractor, on_progress)
 
     # Collect successful receipts for export and set file_id
     successful_receipts = []
@@ -193,7 +388,7 @@ async def run_pipeline(
 
     # If Google Sheets client is provided, append successful extractions
     if gsheets_client and successful_receipts:
-        rows = [receipt_to_sheet_row(receipt) for receipt in successful_receipts]
+        rows = receipts_to_rows(successful_receipts)
         try:
             # Append all rows in a single batch operation
             gsheets_client.append_rows(rows)
@@ -229,7 +424,7 @@ def process(
         ..., "--folder", "-f", help="Google Drive folder ID or URL"
     ),
     workers: int = typer.Option(
-        4, "--workers", "-w", help="Number of parallel download workers"
+        4, "--workers", "-w", help="Number of parallel download and OCR workers"
     ),
     sheet: str | None = typer.Option(
         None,
@@ -242,6 +437,19 @@ def process(
         "--save-local",
         help="Local CSV file path to save receipt data",
     ),
+    batch_mode: bool = typer.Option(
+        False,
+        "--batch-mode/--no-batch-mode",
+        help=(
+            "Submit all LLM extractions as one Anthropic Message Batch: about "
+            "half the token cost, but results may take minutes to arrive"
+        ),
+    ),
+    log_format: LogFormat = typer.Option(  # noqa: B008
+        LogFormat.TEXT,
+        "--log-format",
+        help="Format of per-file progress lines: text, or one JSON object per line",
+    ),
 ):
     """Process files from a Google Drive folder."""
     try:
@@ -265,6 +473,10 @@ def process(
         typer.echo("No supported files found in folder.")
         return
 
+    # Start the largest files first, so a big PDF submitted last does not
+    # leave the run waiting on one straggler. Drive reports size as a string
+    files.sort(key=lambda f: int(f.get("size", 0)), reverse=True)
+
     # Initialize OCR engine
     try:
         ocr_engine = OCREngine()
@@ -284,6 +496,8 @@ def process(
         )
         extractor = None
     else:
+        from slipstream.integrations.anthropic_extractor import AnthropicExtractor
+
         try:
             extractor = AnthropicExtractor(api_key=anthropic_api_key)
         except Exception as e:
@@ -304,30 +518,34 @@ def process(
             typer.echo(f"Failed to initialize Google Sheets client: {e}", err=True)
             raise typer.Exit(code=1) from e
 
-    # Create progress callback for CLI output
-    def cli_progress(event_type: str, message: str):
-        """Callback to handle progress events and output to CLI."""
-        if "error" in event_type:
-            typer.echo(message, err=True)
-        else:
-            typer.echo(message)
-
     # Execute the async pipeline
     async def execute_pipeline():
         """Execute the pipeline with temporary directory management."""
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            dest_dir = Path(tmp_dir)
-            download_results = client.download_files(files, dest_dir)
-            await run_pipeline(
-                download_results=download_results,
-                ocr_engine=ocr_engine,
-                extractor=extractor,
-                gsheets_client=gsheets_client,
-                local_path=save_local,
-                on_progress=cli_progress,
-            )
-
-    asyncio.run(execute_pipeline())
+        # Progress events are printed in batches by a background task
+        cli_progress = _BatchedProgress(log_format=log_format)
+        printer = asyncio.create_task(cli_progress.run())
+        try:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                dest_dir = Path(tmp_dir)
+                download_results = client.download_files(files, dest_dir)
+                await run_pipeline(
+                    download_results=download_results,
+                    ocr_engine=ocr_engine,
+                    extractor=extractor,
+                    gsheets_client=gsheets_client,
+                    local_path=save_local,
+                    on_progress=cli_progress,
+                    batch_extraction=batch_mode,
+                    workers=workers,
+                )
+        finally:
+            cli_progress.close()
+            await printer
+            # Release the extractor's pooled connections within this loop
+            if extractor:
+                await extractor.close()
+
+    _run_event_loop(execute_pipeline())
 
 
 def main():
@@ -1,9 +1,13 @@
 """Data models for receipt extraction and processing."""
 
 from datetime import UTC, datetime
+from functools import partial
 
 from pydantic import BaseModel, Field
 
+# Current UTC time, passed to pydantic as a default factory without a lambda
+_now_utc = partial(datetime.now, UTC)
+
 
 class ReceiptItem(BaseModel):
     """Individual line item on a receipt."""
@@ -39,7 +43,7 @@ class ExtractionResult(BaseModel):
     cache_creation_input_tokens: int = 0
     cache_read_input_tokens: int = 0
     processing_time: float  # in seconds
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    timestamp: datetime = Field(default_factory=_now_utc)
 
 
 class ProcessingResult(BaseModel):
@@ -1,20 +1,20 @@
 import re
-from urllib.parse import urlparse
 
 
 class URLParserError(ValueError):
     """Raised when a URL cannot be parsed for a Google ID."""
 
 
-# Regex patterns for different Google URL formats
-PATTERNS = [
-    # Google Drive Folders: /drive/folders/{ID} or /drive/u/0/folders/{ID}
-    re.compile(r"/drive/(?:u/\d+/)?folders/([a-zA-Z0-9_-]+)"),
-    # Google Drive Files: /file/d/{ID}/view
-    re.compile(r"/file/d/([a-zA-Z0-9_-]+)"),
-    # Google Sheets: /spreadsheets/d/{ID}/edit
-    re.compile(r"/spreadsheets/d/([a-zA-Z0-9_-]+)"),
-]
+# One alternation over the supported Google URL formats, with a named group
+# per format so a single scan finds whichever ID is present:
+#   Google Drive Folders: /drive/folders/{ID} or /drive/u/0/folders/{ID}
+#   Google Drive Files: /file/d/{ID}/view
+#   Google Sheets: /spreadsheets/d/{ID}/edit
+COMBINED = re.compile(
+    r"/drive/(?:u/\d+/)?folders/(?P<folder>[a-zA-Z0-9_-]+)"
+    r"|/file/d/(?P<file>[a-zA-Z0-9_-]+)"
+    r"|/spreadsheets/d/(?P<sheet>[a-zA-Z0-9_-]+)"
+)
 
 
 def parse_google_id(input_str: str) -> str:
@@ -28,14 +28,18 @@ def parse_google_id(input_str: str) -> str:
     if not input_str.startswith("http"):
         return input_str
 
-    parsed = urlparse(input_str)
-
-    if parsed.netloc not in ("drive.google.com", "docs.google.com"):
+    # Split out the host and path with str.partition rather than urlparse;
+    # only these two parts are needed, so building a ParseResult is wasted work
+    _, _, rest = input_str.partition("://")
+    # Drop the query string and fragment so only the host and path remain
+    rest = rest.partition("?")[0].partition("#")[0]
+    netloc, _, path = rest.partition("/")
+    if netloc not in ("drive.google.com", "docs.google.com"):
         raise URLParserError("Unsupported URL domain")
 
-    for pattern in PATTERNS:
-        match = pattern.search(parsed.path)
-        if match:
-            return match.group(1)
+    match = COMBINED.search("/" + path)
+    if match:
+        # Exactly one alternative matched, so exactly one group is set
+        return next(group for group in match.groups() if group)
 
     raise URLParserError("Could not find ID in URL")
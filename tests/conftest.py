@@ -1,3 +1,25 @@
+import sys
+
+import pytest
 from dotenv import load_dotenv
 
 load_dotenv()
+
+
+@pytest.fixture(autouse=True)
+def _clear_slipstream_caches():
+    """Clear functools caches in loaded slipstream modules after each test.
+
+    Cached values such as the shared Vision client may have been created
+    under a test's mock.patch; clearing them stops that state leaking into
+    later tests. Only modules already imported are visited, so this does not
+    pull in every SDK.
+    """
+    yield
+    for name, module in list(sys.modules.items()):
+        if name != "slipstream" and not name.startswith("slipstream."):
+            continue
+        for obj in list(vars(module).values()):
+            cache_clear = getattr(obj, "cache_clear", None)
+            if callable(cache_clear):
+                cache_clear()
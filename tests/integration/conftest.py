@@ -0,0 +1,66 @@
+"""Shared fixtures for integration tests."""
+
+import os
+from types import SimpleNamespace
+
+import pytest
+from typer.testing import CliRunner
+
+# Environment variables required by the Google Drive integration tests
+GDRIVE_REQUIRED_VARS = [
+    "TEST_GDRIVE_FOLDER_URL",
+    "TEST_GDRIVE_FOLDER_ID",
+    "TEST_GDRIVE_EMPTY_FOLDER_ID",
+]
+
+
+@pytest.fixture(scope="session")
+def cli_runner():
+    """CliRunner shared by all integration tests (stdout and stderr separate)."""
+    return CliRunner()
+
+
+@pytest.fixture(scope="session")
+def gdrive_env():
+    """Google Drive test configuration, read from the environment once.
+
+    Tests requesting this fixture are skipped if any required variable is not
+    set (see .env.example).
+
+    Returns:
+        Namespace with folder_url, folder_id, empty_folder_id and file_count
+    """
+    missing = [var for var in GDRIVE_REQUIRED_VARS if not os.getenv(var)]
+    if missing:
+        pytest.skip(
+            f"Missing required environment variables: {', '.join(missing)}. "
+            "Ensure they are set in your environment or .env file."
+        )
+    return SimpleNamespace(
+        folder_url=os.environ["TEST_GDRIVE_FOLDER_URL"],
+        folder_id=os.environ["TEST_GDRIVE_FOLDER_ID"],
+        empty_folder_id=os.environ["TEST_GDRIVE_EMPTY_FOLDER_ID"],
+        file_count=int(os.getenv("TEST_GDRIVE_FILE_COUNT", "3")),
+    )
+
+
+@pytest.fixture
+def make_anthropic_mock(mocker):
+    """Factory patching AnthropicExtractor with scripted extraction results.
+
+    Returns:
+        Callable taking the side_effect list for extract_receipt_data (results
+        or exceptions, one per file) and returning the patched class
+    """
+
+    def _make(side_effects):
+        mock = mocker.patch(
+            "slipstream.integrations.anthropic_extractor.AnthropicExtractor",
+            autospec=True,
+        )
+        mock.return_value.extract_receipt_data = mocker.AsyncMock(
+            side_effect=side_effects
+        )
+        return mock
+
+    return _make
@@ -8,28 +8,10 @@ These tests require:
 - Execute with: pytest -m integration
 """
 
-import os
-
 import pytest
-from typer.testing import CliRunner
 
 from slipstream.main import app
-from tests.integration.utils import skip_if_missing_env_vars
-
-# Test data from environment variables (no defaults - must be set by developer)
-TEST_FOLDER_URL = os.getenv("TEST_GDRIVE_FOLDER_URL")
-TEST_FOLDER_ID = os.getenv("TEST_GDRIVE_FOLDER_ID")
-EXPECTED_FILE_COUNT = int(os.getenv("TEST_GDRIVE_FILE_COUNT", "3"))
-EMPTY_FOLDER_ID = os.getenv("TEST_GDRIVE_EMPTY_FOLDER_ID")
-
-runner = CliRunner()
-
-
-GDRIVE_REQUIRED_VARS = [
-    "TEST_GDRIVE_FOLDER_URL",
-    "TEST_GDRIVE_FOLDER_ID",
-    "TEST_GDRIVE_EMPTY_FOLDER_ID",
-]
+from tests.integration.utils import count_progress
 
 
 @pytest.fixture
@@ -44,9 +26,11 @@ def integration_env():
     # Future: Add cleanup if needed
 
 
-def run_app_and_verify_success(args, expected_folder_id):
+def run_app_and_verify_success(
+    cli_runner, args, expected_folder_id, expected_file_count
+):
     """Helper to run the app and verify common success criteria."""
-    result = runner.invoke(app, ["process", *args])
+    result = cli_runner.invoke(app, ["process", *args])
 
     # Verify exit code is 0
     assert result.exit_code == 0, (
@@ -57,64 +41,36 @@ def run_app_and_verify_success(args, expected_folder_id):
     assert f"Processing folder: {expected_folder_id}" in result.stdout
 
     # Verify all files are reported as downloaded
-    download_count = result.stdout.count("Downloaded")
-    assert download_count == EXPECTED_FILE_COUNT, (
-        f"Expected {EXPECTED_FILE_COUNT} files to be downloaded, found {download_count}"
+    download_count = count_progress(result.stdout)["Downloaded"]
+    assert download_count == expected_file_count, (
+        f"Expected {expected_file_count} files to be downloaded, found {download_count}"
     )
     return result
 
 
 @pytest.mark.integration
-@skip_if_missing_env_vars(GDRIVE_REQUIRED_VARS)
-def test_process_folder_via_url(integration_env):
-    """Scenario 1: Process Folder via URL (Happy Path).
-
-    Verifies that providing a valid Google Drive folder URL correctly triggers
-    the download of all supported files.
-    """
-    run_app_and_verify_success(["--folder", TEST_FOLDER_URL], TEST_FOLDER_ID)
-
-
-@pytest.mark.integration
-@skip_if_missing_env_vars(GDRIVE_REQUIRED_VARS)
-def test_process_folder_via_id(integration_env):
-    """Scenario 2: Process Folder via Folder ID.
+@pytest.mark.parametrize("folder_attr", ["folder_url", "folder_id"], ids=["url", "id"])
+def test_process_folder(integration_env, cli_runner, gdrive_env, folder_attr):
+    """Scenarios 1 and 2: Process Folder via URL or Folder ID (Happy Path).
 
-    Verifies that providing a raw Google Drive folder ID works identically to the URL.
+    Verifies that a valid Google Drive folder URL, or the raw folder ID,
+    correctly triggers the download of all supported files.
     """
-    run_app_and_verify_success(["--folder", TEST_FOLDER_ID], TEST_FOLDER_ID)
-
-
-@pytest.mark.integration
-def test_process_invalid_folder_id(integration_env):
-    """Scenario 3: Process Invalid Folder ID.
-
-    Verifies the system's behavior when a non-existent or inaccessible folder ID is provided.
-    """
-    # This test doesn't require env vars since it uses a fake ID
-    invalid_folder_id = "non_existent_id_12345"
-    result = runner.invoke(app, ["process", "--folder", invalid_folder_id])
-
-    # Verify exit code is non-zero
-    assert result.exit_code == 1, (
-        f"Expected exit code 1, got {result.exit_code}\nOutput: {result.stdout}\nError: {result.stderr}"
-    )
-
-    # Verify error message is shown
-    # The error should mention Google Drive communication issue
-    assert "Error communicating with Google Drive" in result.stderr, (
-        f"Expected error message about Google Drive communication\nStderr: {result.stderr}"
+    run_app_and_verify_success(
+        cli_runner,
+        ["--folder", getattr(gdrive_env, folder_attr)],
+        gdrive_env.folder_id,
+        gdrive_env.file_count,
     )
 
 
 @pytest.mark.integration
-@skip_if_missing_env_vars(GDRIVE_REQUIRED_VARS)
-def test_process_empty_folder(integration_env):
-    """Scenario 4: Process Empty Folder (or folder with no supported files).
+def test_process_empty_folder(integration_env, gdrive_env, cli_runner):
+    """Scenario 3: Process Empty Folder (or folder with no supported files).
 
     Verifies behavior when no files match the required MIME types.
     """
-    result = runner.invoke(app, ["process", "--folder", EMPTY_FOLDER_ID])
+    result = cli_runner.invoke(app, ["process", "--folder", gdrive_env.empty_folder_id])
 
     # Verify exit code is 0 (graceful handling)
     assert result.exit_code == 0, (
@@ -1,34 +1,25 @@
 import functools
-import os
+import re
+from collections import Counter
 
 import pytest
 from google.api_core.exceptions import PermissionDenied
 
 from tests.utils import clean_cli_output
 
+# Per-file progress messages printed by the CLI, counted in one scan of stdout
+PROGRESS_RE = re.compile(r"Downloaded|Extracted text from|Structured data extracted")
 
-def skip_if_missing_env_vars(required_vars):
-    """
-    Decorator to skip tests if required environment variables are not set.
 
-    Args:
-        required_vars (list): List of environment variable names to check.
-    """
+BILLING_SKIP_REASON = (
+    "Google Cloud Vision API requires billing to be enabled. "
+    "Enable billing on your project or skip integration tests."
+)
 
-    def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            missing = [var for var in required_vars if not os.getenv(var)]
-            if missing:
-                pytest.skip(
-                    f"Missing required environment variables: {', '.join(missing)}. "
-                    "Ensure they are set in your environment or .env file."
-                )
-            return func(*args, **kwargs)
 
-        return wrapper
-
-    return decorator
+def is_billing_error(error):
+    """Return True if error is a PermissionDenied caused by disabled billing."""
+    return isinstance(error, PermissionDenied) and "billing" in str(error).lower()
 
 
 def skip_on_billing_error(func):
@@ -43,16 +34,27 @@ def skip_on_billing_error(func):
         try:
             return func(*args, **kwargs)
         except PermissionDenied as e:
-            if "billing" in str(e).lower():
-                pytest.skip(
-                    "Google Cloud Vision API requires billing to be enabled. "
-                    "Enable billing on your project or skip integration tests."
-                )
+            if is_billing_error(e):
+                pytest.skip(BILLING_SKIP_REASON)
             raise
 
     return wrapper
 
 
+def count_progress(stdout):
+    """
+    Count the CLI's per-file progress messages in a single pass.
+
+    Args:
+        stdout: CLI standard output
+
+    Returns:
+        Counter keyed by message prefix ("Downloaded", "Extracted text from",
+        "Structured data extracted")
+    """
+    return Counter(PROGRESS_RE.findall(stdout))
+
+
 def verify_cli_success(result, expected_folder_id, expected_file_count):
     """
     Verify common CLI success criteria for workflow tests.
@@ -61,6 +63,9 @@ def verify_cli_success(result, expected_folder_id, expected_file_count):
         result: CliRunner result object from typer.testing
         expected_folder_id: Expected folder ID in output
         expected_file_count: Expected number of downloaded files
+
+    Returns:
+        Progress message counts from count_progress, for further assertions
     """
     assert result.exit_code == 0, (
         f"Expected exit code 0, got {result.exit_code}\n"
@@ -73,11 +78,12 @@ def verify_cli_success(result, expected_folder_id, expected_file_count):
         f"Expected folder ID {expected_folder_id} in output\nOutput: {result.stdout}"
     )
 
-    download_count = clean_stdout.count("Downloaded")
-    assert download_count == expected_file_count, (
-        f"Expected {expected_file_count} files downloaded, found {download_count}\n"
-        f"Output: {result.stdout}"
+    counts = count_progress(result.stdout)
+    assert counts["Downloaded"] == expected_file_count, (
+        f"Expected {expected_file_count} files downloaded, "
+        f"found {counts['Downloaded']}\nOutput: {result.stdout}"
     )
+    return counts
 
 
 def verify_cli_error(result, expected_exit_code, expected_error_substring):
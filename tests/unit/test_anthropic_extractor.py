@@ -1,19 +1,30 @@
 """Unit tests for Anthropic extractor integration."""
 
+import asyncio
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
+import anthropic
 import pytest
+from pydantic import ValidationError
+from tenacity import wait_none
 
 from slipstream.integrations.anthropic_extractor import (
+    PACKED_MAX_OUTPUT_TOKENS,
     AnthropicExtractor,
+    ExtractionError,
     ExtractionIncompleteError,
     ExtractionRefusedError,
+    _ReceiptBatch,
 )
-from slipstream.models import Receipt, ReceiptItem
+from slipstream.models import ExtractionResult, Receipt, ReceiptItem
 
+# Prompt templates at the project root, resolved once at import
+PROMPTS_DIR = str(Path(__file__).resolve().parents[2] / "prompts")
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def api_key():
     """Provide a test API key."""
     return "sk-test-key-12345"
@@ -57,10 +68,58 @@ def sample_receipt():
 
 
 @pytest.fixture
+def no_retry_wait(monkeypatch):
+    """Disable retry backoff so retry tests run instantly."""
+    monkeypatch.setattr(
+        AnthropicExtractor.extract_receipt_data.retry, "wait", wait_none()
+    )
+    monkeypatch.setattr(AnthropicExtractor._parse_packed.retry, "wait", wait_none())
+
+
+def _parse_response(
+    parsed_output=None,
+    stop_reason="end_turn",
+    input_tokens=500,
+    output_tokens=300,
+    cache_creation_input_tokens=0,
+    cache_read_input_tokens=0,
+):
+    """Build a stand-in for a beta.messages.parse response.
+
+    A plain SimpleNamespace is enough here and much cheaper than MagicMock.
+    """
+    return SimpleNamespace(
+        stop_reason=stop_reason,
+        parsed_output=parsed_output,
+        usage=SimpleNamespace(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cache_creation_input_tokens=cache_creation_input_tokens,
+            cache_read_input_tokens=cache_read_input_tokens,
+        ),
+    )
+
+
+def _api_status_error(status_code: int) -> anthropic.APIStatusError:
+    """Build an Anthropic API status error with the given HTTP status."""
+    response = MagicMock(status_code=status_code)
+    return anthropic.APIStatusError(f"HTTP {status_code}", response=response, body=None)
+
+
+@pytest.fixture(scope="module")
 def prompts_dir():
     """Get the prompts directory path."""
-    project_root = Path(__file__).parent.parent.parent
-    return str(project_root / "prompts")
+    return PROMPTS_DIR
+
+
+@pytest.fixture(scope="module")
+def extractor(api_key, prompts_dir):
+    """Provide one extractor shared by the module's tests.
+
+    Tests patch its client through monkeypatch, which undoes the patches on
+    teardown, so sharing the instance does not leak state between tests.
+    """
+    return AnthropicExtractor(api_key=api_key, prompts_dir=prompts_dir)
 
 
 class TestAnthropicExtractorInit:
@@ -97,20 +156,32 @@ class TestAnthropicExtractorInit:
         assert user_template is not None
 
 
+@pytest.mark.asyncio
+async def test_async_context_manager_closes_client(api_key, prompts_dir, monkeypatch):
+    """Test that leaving the async context closes the HTTP client."""
+    extractor = AnthropicExtractor(api_key=api_key, prompts_dir=prompts_dir)
+    mock_close = AsyncMock()
+    monkeypatch.setattr(extractor.client, "close", mock_close)
+
+    async with extractor as entered:
+        assert entered is extractor
+        mock_close.assert_not_called()
+
+    mock_close.assert_awaited_once()
+
+
 class TestPromptRendering:
     """Test cases for prompt template rendering."""
 
-    def test_render_prompts_system(self, api_key, sample_ocr_text, prompts_dir):
+    def test_render_prompts_system(self, extractor, sample_ocr_text):
         """Test that system prompt is rendered correctly."""
-        extractor = AnthropicExtractor(api_key=api_key, prompts_dir=prompts_dir)
         system_prompt, _ = extractor._render_prompts(sample_ocr_text)
 
         assert "receipt data extraction" in system_prompt.lower()
         assert "json" in system_prompt.lower()
 
-    def test_render_prompts_user(self, api_key, sample_ocr_text, prompts_dir):
+    def test_render_prompts_user(self, extractor, sample_ocr_text):
         """Test that user prompt includes OCR text."""
-        extractor = AnthropicExtractor(api_key=api_key, prompts_dir=prompts_dir)
         _, user_prompt = extractor._render_prompts(sample_ocr_text)
 
         assert "早安美芝城" in user_prompt
@@ -122,24 +193,17 @@ class TestExtractionSuccess:
 
     @pytest.mark.asyncio
     async def test_extract_receipt_data_success(
-        self, api_key, sample_ocr_text, sample_receipt, prompts_dir, mocker
+        self, extractor, sample_ocr_text, sample_receipt, monkeypatch
     ):
         """Test successful receipt data extraction."""
         # Create mock response
-        mock_response = MagicMock()
-        mock_response.stop_reason = "end_turn"
-        mock_response.parsed_output = sample_receipt
-        mock_response.usage = MagicMock(
-            input_tokens=500,
-            output_tokens=300,
-            cache_creation_input_tokens=2000,
-            cache_read_input_tokens=0,
+        mock_response = _parse_response(
+            sample_receipt, cache_creation_input_tokens=2000
         )
 
         # Mock the client's beta.messages.parse method
-        extractor = AnthropicExtractor(api_key=api_key, prompts_dir=prompts_dir)
         mock_parse = AsyncMock(return_value=mock_response)
-        mocker.patch.object(extractor.client.beta.messages, "parse", mock_parse)
+        monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
 
         # Execute extraction
         result = await extractor.extract_receipt_data(sample_ocr_text)
@@ -157,37 +221,38 @@ class TestExtractionSuccess:
         mock_parse.assert_called_once()
         call_kwargs = mock_parse.call_args.kwargs
         assert call_kwargs["model"] == "claude-haiku-4-5"
-        assert call_kwargs["max_tokens"] == 2048
+        # Short receipt, so the output cap is sized below the configured max
+        assert 256 <= call_kwargs["max_tokens"] < 2048
         assert call_kwargs["temperature"] == 0.0
         assert call_kwargs["betas"] == ["structured-outputs-2025-11-13"]
         assert call_kwargs["output_format"] == Receipt
 
-        # Verify system prompt uses cache_control
+        # Verify system prompt is sent as a single text block
         system_param = call_kwargs["system"]
         assert isinstance(system_param, list)
         assert len(system_param) == 1
         assert system_param[0]["type"] == "text"
-        assert "cache_control" in system_param[0]
-        assert system_param[0]["cache_control"] == {"type": "ephemeral"}
+
+        # Verify the static user instructions carry the only cache breakpoint
+        user_content = call_kwargs["messages"][0]["content"]
+        assert len(user_content) == 2
+        assert user_content[0]["cache_control"] == {"type": "ephemeral"}
+        assert "cache_control" not in user_content[1]
+        assert "cache_control" not in system_param[0]
+        assert "早安美芝城" in user_content[1]["text"]
+        assert "早安美芝城" not in user_content[0]["text"]
 
     @pytest.mark.asyncio
     async def test_extract_receipt_data_with_custom_max_tokens(
-        self, api_key, sample_ocr_text, sample_receipt, prompts_dir, mocker
+        self, extractor, sample_ocr_text, sample_receipt, monkeypatch
     ):
         """Test extraction with custom max_tokens override."""
-        mock_response = MagicMock()
-        mock_response.stop_reason = "end_turn"
-        mock_response.parsed_output = sample_receipt
-        mock_response.usage = MagicMock(
-            input_tokens=500,
-            output_tokens=300,
-            cache_creation_input_tokens=2000,
-            cache_read_input_tokens=0,
+        mock_response = _parse_response(
+            sample_receipt, cache_creation_input_tokens=2000
         )
 
-        extractor = AnthropicExtractor(api_key=api_key, prompts_dir=prompts_dir)
         mock_parse = AsyncMock(return_value=mock_response)
-        mocker.patch.object(extractor.client.beta.messages, "parse", mock_parse)
+        monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
 
         # Execute with custom max_tokens
         await extractor.extract_receipt_data(sample_ocr_text, max_tokens=4096)
@@ -196,21 +261,51 @@ class TestExtractionSuccess:
         call_kwargs = mock_parse.call_args.kwargs
         assert call_kwargs["max_tokens"] == 4096
 
+    @pytest.mark.asyncio
+    async def test_long_receipt_output_cap_is_bounded_by_max_tokens(
+        self, extractor, sample_receipt, monkeypatch
+    ):
+        """Test that the adaptive output cap never exceeds max_tokens."""
+        mock_response = _parse_response(sample_receipt)
+
+        mock_parse = AsyncMock(return_value=mock_response)
+        monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
+
+        await extractor.extract_receipt_data("總計:190\n" * 1000)
+
+        assert mock_parse.call_args.kwargs["max_tokens"] == 2048
+
+    @pytest.mark.asyncio
+    async def test_truncated_adaptive_cap_retries_with_max_tokens(
+        self, extractor, sample_ocr_text, sample_receipt, monkeypatch
+    ):
+        """Test that hitting the adaptive cap retries once with max_tokens."""
+        truncated = _parse_response(stop_reason="max_tokens")
+        mock_response = _parse_response(sample_receipt)
+
+        mock_parse = AsyncMock(side_effect=[truncated, mock_response])
+        monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
+
+        result = await extractor.extract_receipt_data(sample_ocr_text)
+
+        assert result.receipt == sample_receipt
+        first_cap = mock_parse.call_args_list[0].kwargs["max_tokens"]
+        second_cap = mock_parse.call_args_list[1].kwargs["max_tokens"]
+        assert first_cap < second_cap == 2048
+
 
 class TestExtractionErrors:
     """Test cases for extraction error handling."""
 
     @pytest.mark.asyncio
     async def test_extraction_refused_error(
-        self, api_key, sample_ocr_text, prompts_dir, mocker
+        self, extractor, sample_ocr_text, monkeypatch
     ):
         """Test handling of model refusal."""
-        mock_response = MagicMock()
-        mock_response.stop_reason = "refusal"
+        mock_response = _parse_response(stop_reason="refusal")
 
-        extractor = AnthropicExtractor(api_key=api_key, prompts_dir=prompts_dir)
         mock_parse = AsyncMock(return_value=mock_response)
-        mocker.patch.object(extractor.client.beta.messages, "parse", mock_parse)
+        monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
 
         with pytest.raises(ExtractionRefusedError) as exc_info:
             await extractor.extract_receipt_data(sample_ocr_text)
@@ -219,15 +314,13 @@ class TestExtractionErrors:
 
     @pytest.mark.asyncio
     async def test_extraction_max_tokens_error(
-        self, api_key, sample_ocr_text, prompts_dir, mocker
+        self, extractor, sample_ocr_text, monkeypatch
     ):
         """Test handling of max_tokens truncation."""
-        mock_response = MagicMock()
-        mock_response.stop_reason = "max_tokens"
+        mock_response = _parse_response(stop_reason="max_tokens")
 
-        extractor = AnthropicExtractor(api_key=api_key, prompts_dir=prompts_dir)
         mock_parse = AsyncMock(return_value=mock_response)
-        mocker.patch.object(extractor.client.beta.messages, "parse", mock_parse)
+        monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
 
         with pytest.raises(ExtractionIncompleteError) as exc_info:
             await extractor.extract_receipt_data(sample_ocr_text)
@@ -241,33 +334,554 @@ class TestRetryLogic:
 
     @pytest.mark.asyncio
     async def test_retry_on_api_error(
-        self, api_key, sample_ocr_text, sample_receipt, prompts_dir, mocker
+        self, extractor, sample_ocr_text, sample_receipt, monkeypatch, no_retry_wait
     ):
-        """Test that API errors trigger retry logic."""
+        """Test that transient API errors trigger retry logic."""
         # Create a mock that fails twice then succeeds
-        mock_response = MagicMock()
-        mock_response.stop_reason = "end_turn"
-        mock_response.parsed_output = sample_receipt
-        mock_response.usage = MagicMock(
-            input_tokens=500,
-            output_tokens=300,
-            cache_creation_input_tokens=2000,
-            cache_read_input_tokens=0,
+        mock_response = _parse_response(
+            sample_receipt, cache_creation_input_tokens=2000
         )
 
-        extractor = AnthropicExtractor(api_key=api_key, prompts_dir=prompts_dir)
-        mock_parse = AsyncMock(
-            side_effect=[
-                Exception("API Error 1"),
-                Exception("API Error 2"),
-                mock_response,
-            ]
-        )
-        mocker.patch.object(extractor.client.beta.messages, "parse", mock_parse)
+        errors = [
+            anthropic.APIConnectionError(request=MagicMock()),
+            _api_status_error(529),
+        ]
+        call_count = 0
+
+        async def fake_parse(**kwargs):
+            nonlocal call_count
+            call_count += 1
+            if call_count <= len(errors):
+                raise errors[call_count - 1]
+            return mock_response
+
+        monkeypatch.setattr(extractor.client.beta.messages, "parse", fake_parse)
 
         # Should succeed after retries
         result = await extractor.extract_receipt_data(sample_ocr_text)
         assert result.receipt == sample_receipt
 
         # Verify it was called 3 times (2 failures + 1 success)
-        assert mock_parse.call_count == 3
+        assert call_count == 3
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status_code", [400, 401, 403])
+    async def test_no_retry_on_client_error(
+        self, extractor, sample_ocr_text, monkeypatch, no_retry_wait, status_code
+    ):
+        """Test that non-transient API errors are raised without retry."""
+        mock_parse = AsyncMock(side_effect=_api_status_error(status_code))
+        monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
+
+        with pytest.raises(anthropic.APIStatusError):
+            await extractor.extract_receipt_data(sample_ocr_text)
+
+        assert mock_parse.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_no_retry_on_refusal(
+        self, extractor, sample_ocr_text, monkeypatch, no_retry_wait
+    ):
+        """Test that a model refusal is not retried."""
+        mock_response = _parse_response(stop_reason="refusal")
+
+        mock_parse = AsyncMock(return_value=mock_response)
+        monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
+
+        with pytest.raises(ExtractionRefusedError):
+            await extractor.extract_receipt_data(sample_ocr_text)
+
+        assert mock_parse.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_validation_error_feeds_back_once(
+        self, extractor, sample_ocr_text, sample_receipt, monkeypatch
+    ):
+        """Test that a schema validation error is fed back to the model once."""
+        try:
+            Receipt.model_validate({})
+        except ValidationError as e:
+            validation_error = e
+
+        mock_response = _parse_response(sample_receipt)
+
+        mock_parse = AsyncMock(side_effect=[validation_error, mock_response])
+        monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
+
+        result = await extractor.extract_receipt_data(sample_ocr_text)
+
+        assert result.receipt == sample_receipt
+        assert mock_parse.call_count == 2
+        retry_content = mock_parse.call_args.kwargs["messages"][0]["content"]
+        assert "merchant_name" in retry_content[-1]["text"]
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_api_call(
+    api_key,
+    sample_ocr_text,
+    sample_receipt,
+    prompts_dir,
+    monkeypatch,
+    tmp_path,
+):
+    """Test that a repeated extraction is served from the cache."""
+    mock_response = _parse_response(sample_receipt, cache_creation_input_tokens=2000)
+
+    extractor = AnthropicExtractor(
+        api_key=api_key, prompts_dir=prompts_dir, cache_dir=tmp_path
+    )
+    mock_parse = AsyncMock(return_value=mock_response)
+    monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
+
+    first = await extractor.extract_receipt_data(sample_ocr_text)
+    second = await extractor.extract_receipt_data(sample_ocr_text)
+
+    assert first.receipt == sample_receipt
+    assert second.receipt == sample_receipt
+    assert second.input_tokens == 0
+    assert second.output_tokens == 0
+    mock_parse.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_on_different_input(
+    api_key,
+    sample_ocr_text,
+    sample_receipt,
+    prompts_dir,
+    monkeypatch,
+    tmp_path,
+):
+    """Test that different OCR text or model does not hit the cache."""
+    mock_response = _parse_response(sample_receipt)
+
+    extractor = AnthropicExtractor(
+        api_key=api_key, prompts_dir=prompts_dir, cache_dir=tmp_path
+    )
+    mock_parse = AsyncMock(return_value=mock_response)
+    monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
+
+    await extractor.extract_receipt_data(sample_ocr_text)
+    await extractor.extract_receipt_data(sample_ocr_text + " changed")
+
+    other_model = AnthropicExtractor(
+        api_key=api_key,
+        model="claude-sonnet-4-5",
+        prompts_dir=prompts_dir,
+        cache_dir=tmp_path,
+    )
+    monkeypatch.setattr(other_model.client.beta.messages, "parse", mock_parse)
+    await other_model.extract_receipt_data(sample_ocr_text)
+
+    assert mock_parse.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_corrupt_cache_entry_falls_back_to_api(
+    api_key,
+    sample_ocr_text,
+    sample_receipt,
+    prompts_dir,
+    monkeypatch,
+    tmp_path,
+):
+    """Test that an unreadable cache entry is treated as a miss."""
+    mock_response = _parse_response(sample_receipt)
+
+    extractor = AnthropicExtractor(
+        api_key=api_key, prompts_dir=prompts_dir, cache_dir=tmp_path
+    )
+    mock_parse = AsyncMock(return_value=mock_response)
+    monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
+
+    await extractor.extract_receipt_data(sample_ocr_text)
+    for entry in tmp_path.glob("*.json"):
+        entry.write_text("not json", encoding="utf-8")
+
+    result = await extractor.extract_receipt_data(sample_ocr_text)
+
+    assert result.receipt == sample_receipt
+    assert mock_parse.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_schema_change_invalidates_cache(
+    api_key,
+    sample_ocr_text,
+    sample_receipt,
+    prompts_dir,
+    monkeypatch,
+    tmp_path,
+):
+    """Test that a changed output schema version does not reuse entries."""
+    mock_response = _parse_response(sample_receipt)
+
+    extractor = AnthropicExtractor(
+        api_key=api_key, prompts_dir=prompts_dir, cache_dir=tmp_path
+    )
+    mock_parse = AsyncMock(return_value=mock_response)
+    monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
+
+    await extractor.extract_receipt_data(sample_ocr_text)
+    monkeypatch.setattr(
+        "slipstream.integrations.anthropic_extractor.SCHEMA_VERSION", "changed"
+    )
+    await extractor.extract_receipt_data(sample_ocr_text)
+
+    assert mock_parse.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_returns_results_in_order(extractor, sample_receipt, monkeypatch):
+    """Test that batch extraction preserves input order."""
+
+    async def fake_extract(ocr_text, max_tokens=None):
+        return ExtractionResult(
+            receipt=sample_receipt.model_copy(update={"raw_text": ocr_text}),
+            input_tokens=1,
+            output_tokens=1,
+            processing_time=0.0,
+        )
+
+    monkeypatch.setattr(extractor, "extract_receipt_data", fake_extract)
+
+    results = await extractor.extract_receipt_data_batch(["a", "b", "c"])
+
+    assert [r.receipt.raw_text for r in results] == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_batch_returns_exceptions_in_place(
+    extractor, sample_receipt, monkeypatch
+):
+    """Test that one failed extraction does not abort the batch."""
+
+    async def fake_extract(ocr_text, max_tokens=None):
+        if ocr_text == "bad":
+            raise ExtractionRefusedError("refused")
+        return ExtractionResult(
+            receipt=sample_receipt,
+            input_tokens=1,
+            output_tokens=1,
+            processing_time=0.0,
+        )
+
+    monkeypatch.setattr(extractor, "extract_receipt_data", fake_extract)
+
+    results = await extractor.extract_receipt_data_batch(["ok", "bad", "ok"])
+
+    assert isinstance(results[0], ExtractionResult)
+    assert isinstance(results[1], ExtractionRefusedError)
+    assert isinstance(results[2], ExtractionResult)
+
+
+@pytest.mark.asyncio
+async def test_batch_respects_max_concurrency(extractor, sample_receipt, monkeypatch):
+    """Test that no more than max_concurrency extractions run at once."""
+    in_flight = 0
+    peak = 0
+
+    async def fake_extract(ocr_text, max_tokens=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return ExtractionResult(
+            receipt=sample_receipt,
+            input_tokens=1,
+            output_tokens=1,
+            processing_time=0.0,
+        )
+
+    monkeypatch.setattr(extractor, "extract_receipt_data", fake_extract)
+
+    results = await extractor.extract_receipt_data_batch(
+        ["text"] * 10, max_concurrency=3
+    )
+
+    assert len(results) == 10
+    assert peak == 3
+
+
+async def _aiter(items):
+    """Yield items from an async iterator, like the SDK's JSONL decoder."""
+    for item in items:
+        yield item
+
+
+def _batch_entry(custom_id, receipt=None, result_type="succeeded", stop="end_turn"):
+    """Build a mock Message Batch result entry."""
+    entry = MagicMock()
+    entry.custom_id = custom_id
+    entry.result.type = result_type
+    if receipt is not None:
+        block = MagicMock(type="text", text=receipt.model_dump_json())
+        entry.result.message.content = [block]
+    entry.result.message.stop_reason = stop
+    entry.result.message.usage.input_tokens = 100
+    entry.result.message.usage.output_tokens = 50
+    entry.result.message.usage.cache_creation_input_tokens = 0
+    entry.result.message.usage.cache_read_input_tokens = 0
+    return entry
+
+
+@pytest.fixture
+def no_poll_sleep(monkeypatch):
+    """Skip the real delay between batch status polls."""
+    mock_sleep = AsyncMock()
+    monkeypatch.setattr(
+        "slipstream.integrations.anthropic_extractor.asyncio.sleep", mock_sleep
+    )
+    return mock_sleep
+
+
+@pytest.mark.asyncio
+async def test_polls_until_ended_and_maps_by_custom_id(
+    extractor, sample_receipt, monkeypatch, no_poll_sleep
+):
+    """Test that results are polled for and returned in input order."""
+    batches = MagicMock()
+    batches.create = AsyncMock(
+        return_value=MagicMock(id="batch_1", processing_status="in_progress")
+    )
+    batches.retrieve = AsyncMock(
+        side_effect=[
+            MagicMock(id="batch_1", processing_status="in_progress"),
+            MagicMock(id="batch_1", processing_status="ended"),
+        ]
+    )
+    first = sample_receipt.model_copy(update={"raw_text": "first"})
+    second = sample_receipt.model_copy(update={"raw_text": "second"})
+    # Results may arrive in any order
+    batches.results = AsyncMock(
+        return_value=_aiter([_batch_entry("1", second), _batch_entry("0", first)])
+    )
+    monkeypatch.setattr(extractor.client.messages, "batches", batches)
+
+    results = await extractor.extract_receipts_batch(["a", "b"])
+
+    requests = batches.create.call_args.kwargs["requests"]
+    assert [r["custom_id"] for r in requests] == ["0", "1"]
+    assert batches.retrieve.call_count == 2
+    assert [s.args[0] for s in no_poll_sleep.await_args_list] == [5.0, 10.0]
+    assert [r.receipt.raw_text for r in results] == ["first", "second"]
+    assert results[0].input_tokens == 100
+
+
+@pytest.mark.asyncio
+async def test_failed_requests_returned_as_errors(
+    extractor, sample_receipt, monkeypatch, no_poll_sleep
+):
+    """Test that errored, refused, and invalid entries become exceptions."""
+    invalid = _batch_entry("3")
+    invalid.result.message.content = [MagicMock(type="text", text="not json")]
+    batches = MagicMock()
+    batches.create = AsyncMock(
+        return_value=MagicMock(id="batch_1", processing_status="ended")
+    )
+    batches.results = AsyncMock(
+        return_value=_aiter(
+            [
+                _batch_entry("0", sample_receipt),
+                _batch_entry("1", result_type="errored"),
+                _batch_entry("2", sample_receipt, stop="refusal"),
+                invalid,
+            ]
+        )
+    )
+    monkeypatch.setattr(extractor.client.messages, "batches", batches)
+
+    results = await extractor.extract_receipts_batch(["a", "b", "c", "d"])
+
+    assert isinstance(results[0], ExtractionResult)
+    assert isinstance(results[1], ExtractionError)
+    assert isinstance(results[2], ExtractionRefusedError)
+    assert isinstance(results[3], ExtractionError)
+    no_poll_sleep.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_cached_texts_are_not_submitted(
+    api_key, sample_receipt, prompts_dir, monkeypatch, tmp_path
+):
+    """Test that cache hits skip the batch entirely."""
+    extractor = AnthropicExtractor(
+        api_key=api_key, prompts_dir=prompts_dir, cache_dir=tmp_path
+    )
+    monkeypatch.setattr(
+        extractor.client.beta.messages,
+        "parse",
+        AsyncMock(return_value=_parse_response(sample_receipt)),
+    )
+    await extractor.extract_receipt_data("a")
+    batches = MagicMock()
+    batches.create = AsyncMock()
+    monkeypatch.setattr(extractor.client.messages, "batches", batches)
+
+    results = await extractor.extract_receipts_batch(["a"])
+
+    batches.create.assert_not_called()
+    assert results[0].receipt == sample_receipt
+    assert results[0].input_tokens == 0
+
+
+def _packed_response(receipts, stop_reason="end_turn"):
+    """Build a mock parse response carrying several receipts."""
+    return _parse_response(
+        _ReceiptBatch(receipts=receipts),
+        stop_reason=stop_reason,
+        input_tokens=900,
+        output_tokens=600,
+        cache_read_input_tokens=300,
+    )
+
+
+@pytest.mark.asyncio
+async def test_packs_texts_into_one_request(extractor, sample_receipt, monkeypatch):
+    """Test that one request returns one result per text, in order."""
+    receipts = [
+        sample_receipt.model_copy(update={"raw_text": text}) for text in ("a", "b", "c")
+    ]
+    mock_parse = AsyncMock(return_value=_packed_response(receipts))
+    monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
+
+    results = await extractor.extract_receipts_packed(["a", "b", "c"])
+
+    mock_parse.assert_awaited_once()
+    kwargs = mock_parse.call_args.kwargs
+    assert kwargs["output_format"] is _ReceiptBatch
+    user_text = kwargs["messages"][0]["content"][1]["text"]
+    assert '<receipt id="1">' in user_text
+    assert '<receipt id="3">' in user_text
+    assert [r.receipt.raw_text for r in results] == ["a", "b", "c"]
+    assert results[0].input_tokens == 300
+    assert results[0].output_tokens == 200
+    assert results[0].cache_read_input_tokens == 100
+
+
+@pytest.mark.asyncio
+async def test_splits_into_chunks_of_batch_size(extractor, sample_receipt, monkeypatch):
+    """Test that texts are packed at most batch_size per request."""
+    mock_parse = AsyncMock(
+        side_effect=[
+            _packed_response([sample_receipt] * 2),
+            _packed_response([sample_receipt] * 2),
+        ]
+    )
+    monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
+
+    results = await extractor.extract_receipts_packed(
+        ["a", "b", "c", "d"], batch_size=2
+    )
+
+    assert mock_parse.await_count == 2
+    assert len(results) == 4
+
+
+@pytest.mark.asyncio
+async def test_count_mismatch_falls_back_to_single_requests(
+    extractor, sample_receipt, monkeypatch
+):
+    """Test that a wrong receipt count re-extracts the chunk one by one."""
+    mock_parse = AsyncMock(return_value=_packed_response([sample_receipt]))
+    monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
+    single = ExtractionResult(
+        receipt=sample_receipt,
+        input_tokens=1,
+        output_tokens=1,
+        processing_time=0.0,
+    )
+    mock_single = AsyncMock(return_value=single)
+    monkeypatch.setattr(extractor, "extract_receipt_data", mock_single)
+
+    results = await extractor.extract_receipts_packed(["a", "b"])
+
+    assert mock_single.await_count == 2
+    assert results == [single, single]
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_does_not_fail_other_chunks(
+    extractor, sample_receipt, monkeypatch, no_retry_wait
+):
+    """Test that a chunk failing after retries only fails its receipts."""
+    call_count = 0
+
+    async def fake_parse(**kwargs):
+        nonlocal call_count
+        call_count += 1
+        user_text = kwargs["messages"][0]["content"][1]["text"]
+        if "overloaded-chunk" in user_text:
+            raise _api_status_error(529)
+        return _packed_response([sample_receipt] * 2)
+
+    monkeypatch.setattr(extractor.client.beta.messages, "parse", fake_parse)
+
+    results = await extractor.extract_receipts_packed(
+        ["overloaded-chunk a", "overloaded-chunk b", "c", "d"], batch_size=2
+    )
+
+    # Three attempts for the overloaded chunk, one for the healthy one
+    assert call_count == 4
+    assert all(isinstance(r, anthropic.APIStatusError) for r in results[:2])
+    assert all(isinstance(r, ExtractionResult) for r in results[2:])
+
+
+@pytest.mark.asyncio
+async def test_refusal_marks_whole_chunk(extractor, sample_receipt, monkeypatch):
+    """Test that a refused packed request fails each of its receipts."""
+    mock_parse = AsyncMock(return_value=_packed_response([], stop_reason="refusal"))
+    monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
+
+    results = await extractor.extract_receipts_packed(["a", "b"])
+
+    assert all(isinstance(r, ExtractionRefusedError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_packed_extraction_shares_concurrency_limit(
+    extractor, sample_receipt, monkeypatch
+):
+    """Test that packed requests and their fallbacks share max_concurrency."""
+    in_flight = 0
+    peak = 0
+
+    async def fake_parse(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if kwargs["output_format"] is _ReceiptBatch:
+            # Wrong receipt count, so every chunk falls back to single requests
+            return _parse_response(_ReceiptBatch(receipts=[sample_receipt]))
+        return _parse_response(sample_receipt)
+
+    monkeypatch.setattr(extractor.client.beta.messages, "parse", fake_parse)
+
+    results = await extractor.extract_receipts_packed(
+        ["text"] * 8, batch_size=2, max_concurrency=3
+    )
+
+    assert all(isinstance(r, ExtractionResult) for r in results)
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_packed_output_cap_is_clamped(
+    api_key, prompts_dir, sample_receipt, monkeypatch
+):
+    """Test that a packed request never asks for more than the packed ceiling."""
+    extractor = AnthropicExtractor(
+        api_key=api_key, prompts_dir=prompts_dir, max_tokens=20_000
+    )
+    mock_parse = AsyncMock(
+        return_value=_parse_response(_ReceiptBatch(receipts=[sample_receipt] * 5))
+    )
+    monkeypatch.setattr(extractor.client.beta.messages, "parse", mock_parse)
+
+    await extractor.extract_receipts_packed(["x" * 30_000] * 5)
+
+    assert mock_parse.call_args.kwargs["max_tokens"] == PACKED_MAX_OUTPUT_TOKENS
@@ -1,10 +1,10 @@
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from typer.testing import CliRunner
 
 from slipstream.integrations.gdrive import DownloadResult
-from slipstream.main import app
+from slipstream.main import LogFormat, _BatchedProgress, app
 from tests.utils import clean_cli_output
 
 pytestmark = pytest.mark.unit
@@ -76,6 +76,14 @@ def test_invalid_folder_url():
     assert "UnsupportedURLdomain" in clean_output
 
 
+def test_dotenv_loaded_when_cli_runs():
+    """Verify .env is loaded by the CLI callback rather than at import time."""
+    with patch("slipstream.main.load_dotenv") as mock_load_dotenv:
+        runner.invoke(app, ["process", "--folder", "https://wrong.com/abc"])
+
+    mock_load_dotenv.assert_called_once_with()
+
+
 def test_process_flow_success(mock_gdrive_client, mock_ocr_engine, tmp_path):
     """Verify the end-to-end flow: parse URL -> list files -> download files."""
     mock_instance = mock_gdrive_client.return_value
@@ -103,6 +111,23 @@ def test_process_flow_success(mock_gdrive_client, mock_ocr_engine, tmp_path):
     assert mock_instance.download_files.called
 
 
+def test_process_downloads_largest_files_first(mock_gdrive_client, mock_ocr_engine):
+    """Verify files are handed to the downloader in descending size order."""
+    mock_instance = mock_gdrive_client.return_value
+    mock_instance.list_files.return_value = [
+        {"id": "small", "name": "s.jpg", "mimeType": "image/jpeg", "size": "10"},
+        {"id": "nosize", "name": "n.jpg", "mimeType": "image/jpeg"},
+        {"id": "large", "name": "l.pdf", "mimeType": "application/pdf", "size": "900"},
+    ]
+    mock_instance.download_files.return_value = iter([])
+
+    result = runner.invoke(app, ["process", "--folder", "some_folder"])
+
+    assert result.exit_code == 0
+    submitted = mock_instance.download_files.call_args.args[0]
+    assert [f["id"] for f in submitted] == ["large", "small", "nosize"]
+
+
 def test_process_empty_folder(mock_gdrive_client):
     """Handle cases where the folder contains no supported files."""
     mock_instance = mock_gdrive_client.return_value
@@ -158,3 +183,109 @@ def test_process_partial_download_failure(
     clean_stderr = clean_cli_output(result.stderr)
     assert "Downloadedr1.jpg" in clean_stdout
     assert "Failedtodownloadr2.png:DownloadFailed" in clean_stderr
+
+
+@pytest.mark.asyncio
+async def test_batched_progress_writes_queued_events_together(mocker):
+    """Verify queued progress events are printed in batches, split by stream."""
+    echo = mocker.patch("slipstream.main.typer.echo")
+    progress = _BatchedProgress(max_batch=3)
+    progress("download_success", "a")
+    progress("download_error", "b")
+    progress("ocr_success", "c")
+    progress("ocr_success", "d")
+    progress.close()
+
+    await progress.run()
+
+    assert echo.call_args_list == [
+        mocker.call("a\nc"),
+        mocker.call("b", err=True),
+        mocker.call("d"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batched_progress_json_log_format(mocker):
+    """Verify --log-format json prints one JSON object per progress event."""
+    echo = mocker.patch("slipstream.main.typer.echo")
+    progress = _BatchedProgress(log_format=LogFormat.JSON)
+    progress("download_success", "Downloaded r1.jpg")
+    progress("ocr_error", "Failed to extract text from r2.png: boom")
+    progress.close()
+
+    await progress.run()
+
+    assert echo.call_args_list == [
+        mocker.call('{"event": "download_success", "message": "Downloaded r1.jpg"}'),
+        mocker.call(
+            '{"event": "ocr_error", '
+            '"message": "Failed to extract text from r2.png: boom"}',
+            err=True,
+        ),
+    ]
+
+
+def test_process_log_format_option(mock_gdrive_client, mock_ocr_engine, tmp_path):
+    """Verify --log-format json switches progress lines to JSON."""
+    mock_instance = mock_gdrive_client.return_value
+    mock_instance.list_files.return_value = [
+        {"id": "f1", "name": "r1.jpg", "mimeType": "image/jpeg"}
+    ]
+    mock_instance.download_files.return_value = iter(
+        [DownloadResult(success=True, file_id="f1", dest_path=tmp_path / "r1.jpg")]
+    )
+
+    result = runner.invoke(
+        app, ["process", "--folder", "some_folder", "--log-format", "json"]
+    )
+
+    assert result.exit_code == 0
+    assert '{"event": "download_success", "message": "Downloaded r1.jpg"}' in (
+        result.stdout.splitlines()
+    )
+
+
+def test_process_closes_extractor_after_run(
+    mock_gdrive_client, mock_ocr_engine, tmp_path, monkeypatch
+):
+    """Verify the extractor's HTTP client is closed once the run finishes."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-test-key")
+    mock_instance = mock_gdrive_client.return_value
+    mock_instance.list_files.return_value = [
+        {"id": "f1", "name": "r1.jpg", "mimeType": "image/jpeg"}
+    ]
+    mock_instance.download_files.return_value = iter(
+        [DownloadResult(success=False, file_id="f1", dest_path=tmp_path / "r1.jpg")]
+    )
+
+    with patch(
+        "slipstream.integrations.anthropic_extractor.AnthropicExtractor"
+    ) as mock_extractor_class:
+        mock_extractor = mock_extractor_class.return_value
+        mock_extractor.close = AsyncMock()
+        result = runner.invoke(app, ["process", "--folder", "some_folder"])
+
+    assert result.exit_code == 0
+    mock_extractor_class.assert_called_once()
+    mock_extractor.close.assert_awaited_once()
+
+
+@pytest.mark.parametrize(
+    ("flags", "expected"),
+    [([], False), (["--batch-mode"], True), (["--no-batch-mode"], False)],
+)
+def test_process_batch_mode_flag(
+    mock_gdrive_client, mock_ocr_engine, tmp_path, flags, expected
+):
+    """Verify --batch-mode opts into Message Batches extraction."""
+    mock_instance = mock_gdrive_client.return_value
+    mock_instance.list_files.return_value = [
+        {"id": "f1", "name": "r1.jpg", "mimeType": "image/jpeg"}
+    ]
+
+    with patch("slipstream.main.run_pipeline", new=AsyncMock()) as mock_run_pipeline:
+        result = runner.invoke(app, ["process", "--folder", "some_folder", *flags])
+
+    assert result.exit_code == 0
+    assert mock_run_pipeline.call_args.kwargs["batch_extraction"] is expected
@@ -1,3 +1,4 @@
+import io
 import unittest.mock as mock
 
 import pytest
@@ -9,7 +10,10 @@ pytestmark = pytest.mark.unit
 
 @pytest.fixture
 def mock_google_build():
-    with mock.patch("slipstream.integrations.gdrive.build") as m:
+    with (
+        mock.patch("slipstream.integrations.gdrive._get_credentials"),
+        mock.patch("slipstream.integrations.gdrive.build") as m,
+    ):
         yield m
 
 
@@ -28,7 +32,8 @@ def test_init_client_success(mock_google_build):
 
     # NOW build() should have been called
     assert service is not None
-    mock_google_build.assert_called_once_with("drive", "v3")
+    mock_google_build.assert_called_once()
+    assert mock_google_build.call_args.args == ("drive", "v3")
 
 
 def test_list_files_in_folder(mock_google_build):
@@ -57,6 +62,7 @@ def test_list_files_filtering(mock_google_build):
     """Scenario 2.3: Filter files by MIME type (JPG, PNG, PDF)."""
     mock_service = mock_google_build.return_value
     mock_files = mock_service.files.return_value
+    mock_files.list.return_value.execute.return_value = {"files": []}
 
     client = GDriveClient()
     mime_types = ["image/jpeg", "image/png", "application/pdf"]
@@ -68,6 +74,26 @@ def test_list_files_filtering(mock_google_build):
     assert "application/pdf" in q
 
 
+def test_list_files_follows_pagination(mock_google_build):
+    """Scenario 2.4: Collect files across all pages of a large folder."""
+    mock_service = mock_google_build.return_value
+    mock_files = mock_service.files.return_value
+    mock_files.list.return_value.execute.side_effect = [
+        {"files": [{"id": "file1"}], "nextPageToken": "page2"},
+        {"files": [{"id": "file2"}]},
+    ]
+
+    client = GDriveClient()
+    files = client.list_files("folder_id_123")
+
+    assert [f["id"] for f in files] == ["file1", "file2"]
+    first_call, second_call = mock_files.list.call_args_list
+    assert first_call.kwargs["pageSize"] == 1000
+    assert first_call.kwargs["pageToken"] is None
+    assert second_call.kwargs["pageToken"] == "page2"
+    assert "nextPageToken" in first_call.kwargs["fields"]
+
+
 def test_download_file_success(mock_google_build, tmp_path):
     """Scenario 3.1: Download a specific file by ID to a local path."""
     mock_service = mock_google_build.return_value
@@ -89,6 +115,27 @@ def test_download_file_success(mock_google_build, tmp_path):
         assert mock_files.get_media.called
 
 
+def test_download_file_to_in_memory_stream(mock_google_build):
+    """Download into a BytesIO sink without touching the filesystem."""
+    with mock.patch(
+        "slipstream.integrations.gdrive.MediaIoBaseDownload"
+    ) as mock_download:
+
+        def fake_downloader(fh, request):
+            fh.write(b"image bytes")
+            downloader = mock.Mock()
+            downloader.next_chunk.return_value = (None, True)
+            return downloader
+
+        mock_download.side_effect = fake_downloader
+
+        client = GDriveClient()
+        buffer = io.BytesIO()
+        client.download_file("file_id_123", buffer)
+
+    assert buffer.getvalue() == b"image bytes"
+
+
 def test_download_file_not_found(mock_google_build, tmp_path):
     """Scenario 3.2: Handle download failures."""
     mock_service = mock_google_build.return_value
@@ -138,3 +185,16 @@ def test_generate_file_url_with_none_returns_empty():
     url = generate_file_url(None)
 
     assert url == ""
+
+
+def test_download_result_is_immutable(tmp_path):
+    """DownloadResult instances cannot be modified after creation."""
+    import dataclasses
+
+    from slipstream.integrations.gdrive import DownloadResult
+
+    result = DownloadResult(success=True, file_id="f1", dest_path=tmp_path / "a.jpg")
+
+    assert result.error is None
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.success = False  # type: ignore[misc]
@@ -1,5 +1,6 @@
 """Unit tests for GDriveClient lazy initialization."""
 
+import io
 import time
 import unittest.mock as mock
 
@@ -13,7 +14,10 @@ pytestmark = pytest.mark.unit
 @pytest.fixture
 def mock_google_build():
     """Mock the build function to track when it's called."""
-    with mock.patch("slipstream.integrations.gdrive.build") as m:
+    with (
+        mock.patch("slipstream.integrations.gdrive._get_credentials"),
+        mock.patch("slipstream.integrations.gdrive.build") as m,
+    ):
         yield m
 
 
@@ -35,7 +39,8 @@ def test_first_service_access_calls_build(mock_google_build):
     # Access service for the first time
     service = client.service
 
-    mock_google_build.assert_called_once_with("drive", "v3")
+    mock_google_build.assert_called_once()
+    assert mock_google_build.call_args.args == ("drive", "v3")
     assert service is mock_service
 
 
@@ -51,7 +56,8 @@ def test_subsequent_service_access_reuses_cached(mock_google_build):
     service3 = client.service
 
     # build() called exactly once, not three times
-    mock_google_build.assert_called_once_with("drive", "v3")
+    mock_google_build.assert_called_once()
+    assert mock_google_build.call_args.args == ("drive", "v3")
     assert service1 is service2 is service3
 
 
@@ -71,36 +77,29 @@ def test_multiple_clients_independent_services(mock_google_build):
     assert service1 is not service2
 
 
-def test_instance_service_independent_from_thread_local(mock_google_build):
-    """Instance service and thread-local service should be independent.
+def test_download_does_not_build_discovery_service(mock_google_build, tmp_path):
+    """Downloads go through the media endpoint without building a service.
 
     This verifies that:
     1. Client instance service uses lazy property pattern
-    2. Thread-local service (used by download_single_file) is independent
+    2. download_single_file uses its own HTTP session, not a Drive service
     3. Both can coexist without interference
     """
-    from slipstream.integrations.gdrive import _get_thread_service
+    from slipstream.integrations.gdrive import download_single_file
 
-    mock_instance_service = mock.Mock(name="instance_service")
-    mock_thread_service = mock.Mock(name="thread_service")
+    with (
+        mock.patch("slipstream.integrations.gdrive._refresh_credentials"),
+        mock.patch("slipstream.integrations.gdrive._get_session") as mock_get_session,
+    ):
+        response = mock.MagicMock()
+        response.__enter__.return_value = response
+        response.raw = io.BytesIO(b"image bytes")
+        mock_get_session.return_value.get.return_value = response
 
-    # First call -> instance service, second call -> thread service
-    mock_google_build.side_effect = [mock_instance_service, mock_thread_service]
+        result = download_single_file({"id": "f1", "name": "r.jpg"}, tmp_path)
 
-    # Create client and access instance service
-    client = GDriveClient()
-    instance_service = client.service
-
-    # Call thread-local service function
-    thread_service = _get_thread_service()
-
-    # Verify two separate build() calls
-    assert mock_google_build.call_count == 2
-
-    # Verify they are different services
-    assert instance_service is mock_instance_service
-    assert thread_service is mock_thread_service
-    assert instance_service is not thread_service
+    assert result.success is True
+    mock_google_build.assert_not_called()
 
 
 def test_service_property_exception_handling(mock_google_build):
@@ -158,3 +157,21 @@ def test_lazy_init_performance_improvement(mock_google_build):
     access_time = time.time() - start
 
     assert access_time >= 0.1, f"Access took {access_time:.3f}s, expected >= 0.1s"
+
+
+def test_services_share_process_credentials():
+    """Every Drive service is built with the same process-wide credentials."""
+    with (
+        mock.patch(
+            "slipstream.integrations.gdrive.google.auth.default",
+            return_value=(mock.Mock(name="credentials"), "project"),
+        ) as mock_default,
+        mock.patch("slipstream.integrations.gdrive._credentials", None),
+        mock.patch("slipstream.integrations.gdrive.build") as mock_build,
+    ):
+        _ = GDriveClient().service
+        _ = GDriveClient().service
+
+    mock_default.assert_called_once()
+    credentials = [c.kwargs["credentials"] for c in mock_build.call_args_list]
+    assert credentials[0] is credentials[1]
@@ -1,30 +1,56 @@
+import io
 import unittest.mock as mock
 
 import pytest
+import requests
 
-from slipstream.integrations.gdrive import GDriveClient, download_single_file
+from slipstream.integrations.gdrive import (
+    DOWNLOAD_TIMEOUT,
+    GDriveClient,
+    download_single_file,
+)
 
 pytestmark = pytest.mark.unit
 
 
 @pytest.fixture(autouse=True)
-def clear_gdrive_thread_local():
-    """Clear the thread-local Drive service before each test to ensure isolation."""
-    from slipstream.integrations.gdrive import _thread_local
-
-    if hasattr(_thread_local, "drive_service"):
-        del _thread_local.drive_service
-    yield
-    if hasattr(_thread_local, "drive_service"):
-        del _thread_local.drive_service
+def clear_gdrive_session():
+    """Reset the shared Drive session before each test to ensure isolation."""
+    with mock.patch("slipstream.integrations.gdrive._session", None):
+        yield
 
 
 @pytest.fixture
 def mock_google_build():
-    with mock.patch("slipstream.integrations.gdrive.build") as m:
+    with (
+        mock.patch("slipstream.integrations.gdrive._get_credentials"),
+        mock.patch("slipstream.integrations.gdrive.build") as m,
+    ):
         yield m
 
 
+def _media_response(body: bytes = b"image bytes", status: int = 200):
+    """Build a mock streaming response for the Drive media endpoint."""
+    response = mock.MagicMock()
+    response.__enter__.return_value = response
+    response.raw = io.BytesIO(body)
+    if status >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(f"{status} Error")
+    return response
+
+
+@pytest.fixture
+def mock_session():
+    """Mock the authorized HTTP session used for media downloads."""
+    with (
+        mock.patch("slipstream.integrations.gdrive._refresh_credentials"),
+        mock.patch("slipstream.integrations.gdrive._get_session") as m,
+    ):
+        session = m.return_value
+        session.get.side_effect = lambda url, **kwargs: _media_response()
+        yield session
+
+
 def test_download_files_method_exists(mock_google_build):
     """Test that download_files method exists on GDriveClient."""
     client = GDriveClient()
@@ -32,92 +58,71 @@ def test_download_files_method_exists(mock_google_build):
     assert callable(client.download_files)
 
 
-def test_download_files_with_single_file(mock_google_build, tmp_path):
+def test_download_files_with_single_file(mock_session, tmp_path):
     """Test download_files with a single file (should work like download_file)."""
-    with mock.patch(
-        "slipstream.integrations.gdrive.MediaIoBaseDownload"
-    ) as mock_download:
-        mock_instance = mock_download.return_value
-        mock_instance.next_chunk.side_effect = [(None, True)]
-
-        client = GDriveClient()
-        files = [{"id": "file1", "name": "receipt1.jpg"}]
+    client = GDriveClient()
+    files = [{"id": "file1", "name": "receipt1.jpg"}]
 
-        # download_files is now a generator, so we need to consume it
-        results = list(client.download_files(files, tmp_path))
+    # download_files is now a generator, so we need to consume it
+    results = list(client.download_files(files, tmp_path))
 
-        assert len(results) == 1
-        assert results[0].success is True
-        assert results[0].file_id == "file1"
-        assert results[0].dest_path == tmp_path / "receipt1.jpg"
+    assert len(results) == 1
+    assert results[0].success is True
+    assert results[0].file_id == "file1"
+    assert results[0].dest_path == tmp_path / "receipt1.jpg"
+    assert results[0].dest_path.read_bytes() == b"image bytes"
 
 
-def test_download_files_with_multiple_files(mock_google_build, tmp_path):
+def test_download_files_with_multiple_files(mock_session, tmp_path):
     """Test download_files with multiple files in parallel."""
-    with mock.patch(
-        "slipstream.integrations.gdrive.MediaIoBaseDownload"
-    ) as mock_download:
-        mock_instance = mock_download.return_value
-        mock_instance.next_chunk.side_effect = [(None, True)] * 3
-
-        client = GDriveClient()
-        files = [
-            {"id": "file1", "name": "receipt1.jpg"},
-            {"id": "file2", "name": "receipt2.png"},
-            {"id": "file3", "name": "receipt3.pdf"},
-        ]
+    client = GDriveClient()
+    files = [
+        {"id": "file1", "name": "receipt1.jpg"},
+        {"id": "file2", "name": "receipt2.png"},
+        {"id": "file3", "name": "receipt3.pdf"},
+    ]
 
-        # download_files is now a generator
-        results = list(client.download_files(files, tmp_path))
+    # download_files is now a generator
+    results = list(client.download_files(files, tmp_path))
 
-        assert len(results) == 3
-        assert all(r.success for r in results)
-        assert {r.file_id for r in results} == {"file1", "file2", "file3"}
+    assert len(results) == 3
+    assert all(r.success for r in results)
+    assert {r.file_id for r in results} == {"file1", "file2", "file3"}
 
 
-def test_download_files_with_error_handling(mock_google_build, tmp_path):
+def test_download_files_with_error_handling(mock_session, tmp_path):
     """Test that download_files continues when one file fails (continue-on-error)."""
-    mock_service = mock_google_build.return_value
-    mock_files = mock_service.files.return_value
-
-    from googleapiclient.errors import HttpError
 
     # Make the second file fail
-    def side_effect_get_media(fileId):
-        if fileId == "file2":
-            raise HttpError(mock.Mock(status=404), b"File not found")
-        return mock.Mock()
-
-    mock_files.get_media.side_effect = side_effect_get_media
+    def side_effect_get(url, **kwargs):
+        if "/files/file2?" in url:
+            return _media_response(status=404)
+        return _media_response()
 
-    with mock.patch(
-        "slipstream.integrations.gdrive.MediaIoBaseDownload"
-    ) as mock_download:
-        mock_instance = mock_download.return_value
-        mock_instance.next_chunk.side_effect = [(None, True)] * 2
+    mock_session.get.side_effect = side_effect_get
 
-        client = GDriveClient()
-        files = [
-            {"id": "file1", "name": "receipt1.jpg"},
-            {"id": "file2", "name": "receipt2.png"},
-            {"id": "file3", "name": "receipt3.pdf"},
-        ]
+    client = GDriveClient()
+    files = [
+        {"id": "file1", "name": "receipt1.jpg"},
+        {"id": "file2", "name": "receipt2.png"},
+        {"id": "file3", "name": "receipt3.pdf"},
+    ]
 
-        # download_files is now a generator
-        results = list(client.download_files(files, tmp_path))
+    # download_files is now a generator
+    results = list(client.download_files(files, tmp_path))
 
-        assert len(results) == 3
-        # file1 and file3 should succeed, file2 should fail
-        success_count = sum(1 for r in results if r.success)
-        failed_count = sum(1 for r in results if not r.success)
+    assert len(results) == 3
+    # file1 and file3 should succeed, file2 should fail
+    success_count = sum(1 for r in results if r.success)
+    failed_count = sum(1 for r in results if not r.success)
 
-        assert success_count == 2
-        assert failed_count == 1
+    assert success_count == 2
+    assert failed_count == 1
 
-        # Find the failed result
-        failed_result = next(r for r in results if not r.success)
-        assert failed_result.file_id == "file2"
-        assert failed_result.error is not None
+    # Find the failed result
+    failed_result = next(r for r in results if not r.success)
+    assert failed_result.file_id == "file2"
+    assert "404" in failed_result.error
 
 
 def test_gdrive_client_accepts_max_workers(mock_google_build):
@@ -134,50 +139,70 @@ def test_gdrive_client_default_max_workers(mock_google_build):
     assert client.max_workers > 0
 
 
-def test_download_files_respects_max_workers(mock_google_build, tmp_path):
+def test_download_files_respects_max_workers(mock_session, tmp_path):
     """Test that download_files respects the max_workers parameter."""
-    with mock.patch(
-        "slipstream.integrations.gdrive.MediaIoBaseDownload"
-    ) as mock_download:
-        mock_instance = mock_download.return_value
-        mock_instance.next_chunk.side_effect = [(None, True)]
+    # Test with different max_workers values
+    client_2 = GDriveClient(max_workers=2)
+    assert client_2.max_workers == 2
+
+    client_8 = GDriveClient(max_workers=8)
+    assert client_8.max_workers == 8
 
-        # Test with different max_workers values
-        client_2 = GDriveClient(max_workers=2)
-        assert client_2.max_workers == 2
+    # Verify download_files can be called successfully
+    files = [{"id": "file1", "name": "receipt1.jpg"}]
+    results = list(client_2.download_files(files, tmp_path))
+    assert len(results) == 1
+    assert results[0].success is True
 
-        client_8 = GDriveClient(max_workers=8)
-        assert client_8.max_workers == 8
 
-        # Verify download_files can be called successfully
-        files = [{"id": "file1", "name": "receipt1.jpg"}]
-        results = list(client_2.download_files(files, tmp_path))
-        assert len(results) == 1
-        assert results[0].success is True
+def test_download_files_yields_every_file_beyond_pending_limit(mock_session, tmp_path):
+    """Test that more files than the in-flight limit are all downloaded once."""
+    client = GDriveClient(max_workers=2)
+    files = [{"id": f"file{i}", "name": f"receipt{i}.jpg"} for i in range(20)]
 
+    results = list(client.download_files(files, tmp_path))
 
-def test_download_single_file_success(mock_google_build, tmp_path):
+    assert sorted(r.file_id for r in results) == sorted(f["id"] for f in files)
+    assert all(r.success for r in results)
+
+
+def test_download_single_file_success(mock_session, tmp_path):
     """Test _download_single_file function directly - success case."""
-    with mock.patch(
-        "slipstream.integrations.gdrive.MediaIoBaseDownload"
-    ) as mock_download:
-        mock_instance = mock_download.return_value
-        mock_instance.next_chunk.return_value = (None, True)
+    file_info = {"id": "test_file_id", "name": "test_receipt.jpg"}
+    result = download_single_file(file_info, tmp_path)
+
+    assert result.success is True
+    assert result.file_id == "test_file_id"
+    assert result.dest_path == tmp_path / "test_receipt.jpg"
+    assert result.error is None
+    url = mock_session.get.call_args.args[0]
+    assert url == "https://www.googleapis.com/drive/v3/files/test_file_id?alt=media"
+    assert mock_session.get.call_args.kwargs["timeout"] == DOWNLOAD_TIMEOUT
+
+
+def test_download_single_file_with_known_size(mock_session, tmp_path):
+    """Test that a reported Drive size does not change the written content."""
+    file_info = {"id": "test_file_id", "name": "test_receipt.jpg", "size": "64"}
+    result = download_single_file(file_info, tmp_path)
+
+    assert result.success is True
+    assert result.dest_path.read_bytes() == b"image bytes"
 
-        file_info = {"id": "test_file_id", "name": "test_receipt.jpg"}
-        result = download_single_file(file_info, tmp_path)
 
-        assert result.success is True
-        assert result.file_id == "test_file_id"
-        assert result.dest_path == tmp_path / "test_receipt.jpg"
-        assert result.error is None
+def test_download_single_file_overwrites_existing_file(mock_session, tmp_path):
+    """Test that a stale, larger file at the destination is truncated."""
+    (tmp_path / "test_receipt.jpg").write_bytes(b"x" * 100)
 
+    file_info = {"id": "test_file_id", "name": "test_receipt.jpg"}
+    result = download_single_file(file_info, tmp_path)
+
+    assert result.success is True
+    assert result.dest_path.read_bytes() == b"image bytes"
 
-def test_download_single_file_error(mock_google_build, tmp_path):
+
+def test_download_single_file_error(mock_session, tmp_path):
     """Test _download_single_file function directly - error case."""
-    mock_service = mock_google_build.return_value
-    mock_files = mock_service.files.return_value
-    mock_files.get_media.side_effect = Exception("Download failed")
+    mock_session.get.side_effect = Exception("Download failed")
 
     file_info = {"id": "test_file_id", "name": "test_receipt.jpg"}
     result = download_single_file(file_info, tmp_path)
@@ -186,3 +211,44 @@ def test_download_single_file_error(mock_google_build, tmp_path):
     assert result.file_id == "test_file_id"
     assert result.dest_path == tmp_path / "test_receipt.jpg"
     assert "Download failed" in result.error
+
+
+def test_download_session_is_shared_across_threads():
+    """Test that one authorized session is created per process, not per thread."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from slipstream.integrations.gdrive import _get_session
+
+    with (
+        mock.patch(
+            "slipstream.integrations.gdrive._get_credentials"
+        ) as mock_credentials,
+        mock.patch("slipstream.integrations.gdrive.AuthorizedSession") as mock_cls,
+    ):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            sessions = list(executor.map(lambda _: _get_session(), range(8)))
+
+    assert all(session is sessions[0] for session in sessions)
+    mock_cls.assert_called_once_with(mock_credentials.return_value)
+
+
+def test_expired_token_is_refreshed_once_across_threads():
+    """Test that concurrent downloads share a single token refresh."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from slipstream.integrations.gdrive import _refresh_credentials
+
+    credentials = mock.Mock(valid=False)
+
+    def refresh(request):
+        credentials.valid = True
+
+    credentials.refresh.side_effect = refresh
+
+    with mock.patch(
+        "slipstream.integrations.gdrive._get_credentials", return_value=credentials
+    ):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: _refresh_credentials(), range(8)))
+
+    credentials.refresh.assert_called_once()
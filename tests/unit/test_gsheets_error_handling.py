@@ -2,6 +2,7 @@
 
 import unittest.mock as mock
 
+import httplib2
 import pytest
 from googleapiclient.errors import HttpError
 
@@ -214,3 +215,106 @@ def test_append_row_invalid_range(mock_google_build):
     assert exc_info.value.resp.status == 400
     # 400 should only be attempted once (not retryable)
     assert mock_append.execute.call_count == 1
+
+
+@pytest.fixture
+def mock_sleep():
+    """Patch the sleep between retries and record the requested waits."""
+    with mock.patch("time.sleep") as m:
+        yield m
+
+
+def _mock_append(mock_google_build, side_effect):
+    """Wire the service so append().execute() follows side_effect."""
+    mock_append = mock.Mock()
+    mock_append.execute.side_effect = side_effect
+    mock_values = mock.Mock()
+    mock_values.append.return_value = mock_append
+    mock_spreadsheets = mock.Mock()
+    mock_spreadsheets.values.return_value = mock_values
+    mock_google_build.spreadsheets.return_value = mock_spreadsheets
+    return mock_append
+
+
+@pytest.mark.parametrize("status", [429, 500, 502, 503, 504])
+def test_append_row_retries_transient_statuses(mock_google_build, mock_sleep, status):
+    """Test that rate limiting and transient server errors are retried."""
+    error = HttpError(mock.Mock(status=status), b"error")
+    mock_append = _mock_append(mock_google_build, [error, {}])
+
+    GSheetsClient(spreadsheet_id="test-sheet-123").append_row(["data"])
+
+    assert mock_append.execute.call_count == 2
+
+
+@pytest.mark.parametrize("status", [400, 403, 404, 501])
+def test_append_row_does_not_retry_other_statuses(
+    mock_google_build, mock_sleep, status
+):
+    """Test that client errors and non-transient server errors fail at once."""
+    error = HttpError(mock.Mock(status=status), b"error")
+    mock_append = _mock_append(mock_google_build, error)
+
+    with pytest.raises(HttpError):
+        GSheetsClient(spreadsheet_id="test-sheet-123").append_row(["data"])
+
+    assert mock_append.execute.call_count == 1
+
+
+def test_append_row_retries_timeout_errors(mock_google_build, mock_sleep):
+    """Test that network timeouts are retried like other network errors."""
+    mock_append = _mock_append(mock_google_build, [TimeoutError(), {}])
+
+    GSheetsClient(spreadsheet_id="test-sheet-123").append_row(["data"])
+
+    assert mock_append.execute.call_count == 2
+
+
+def test_append_row_does_not_retry_plain_errors(mock_google_build, mock_sleep):
+    """Test that errors that are neither HTTP nor network errors fail at once."""
+    mock_append = _mock_append(mock_google_build, ValueError("bad input"))
+
+    with pytest.raises(ValueError, match="bad input"):
+        GSheetsClient(spreadsheet_id="test-sheet-123").append_row(["data"])
+
+    assert mock_append.execute.call_count == 1
+
+
+def test_append_row_honors_retry_after_on_429(mock_google_build, mock_sleep):
+    """Test that a 429 waits exactly the server's Retry-After seconds."""
+    resp = httplib2.Response({"status": 429, "retry-after": "7"})
+    _mock_append(mock_google_build, [HttpError(resp, b"Rate limit exceeded"), {}])
+
+    GSheetsClient(spreadsheet_id="test-sheet-123").append_row(["data"])
+
+    mock_sleep.assert_called_once_with(7.0)
+
+
+def test_append_row_caps_retry_after(mock_google_build, mock_sleep):
+    """Test that an excessive Retry-After is capped."""
+    resp = httplib2.Response({"status": 429, "retry-after": "3600"})
+    _mock_append(mock_google_build, [HttpError(resp, b"Rate limit exceeded"), {}])
+
+    GSheetsClient(spreadsheet_id="test-sheet-123").append_row(["data"])
+
+    mock_sleep.assert_called_once_with(60.0)
+
+
+@pytest.mark.parametrize(
+    "resp",
+    [
+        httplib2.Response({"status": 429}),
+        httplib2.Response({"status": 429, "retry-after": "soon"}),
+        httplib2.Response({"status": 503, "retry-after": "7"}),
+    ],
+)
+def test_append_row_falls_back_to_backoff(mock_google_build, mock_sleep, resp):
+    """Test jittered exponential backoff without a usable Retry-After."""
+    error = HttpError(resp, b"error")
+    _mock_append(mock_google_build, [error, error, error, {}])
+
+    GSheetsClient(spreadsheet_id="test-sheet-123").append_row(["data"])
+
+    # Third retry: 1s * 2**2 plus up to 1s of jitter
+    third_wait = mock_sleep.call_args_list[2].args[0]
+    assert 4.0 <= third_wait <= 5.0
@@ -34,7 +34,7 @@ def test_first_service_access_calls_build(mock_google_build):
     # Access service for the first time
     service = client.service
 
-    mock_google_build.assert_called_once_with("sheets", "v4")
+    mock_google_build.assert_called_once_with("sheets", "v4", static_discovery=True)
     assert service is mock_service
 
 
@@ -50,7 +50,7 @@ def test_subsequent_service_access_reuses_cached(mock_google_build):
     service3 = client.service
 
     # build() called exactly once, not three times
-    mock_google_build.assert_called_once_with("sheets", "v4")
+    mock_google_build.assert_called_once_with("sheets", "v4", static_discovery=True)
     assert service1 is service2 is service3
 
 
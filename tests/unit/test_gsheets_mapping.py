@@ -2,7 +2,7 @@
 
 import pytest
 
-from slipstream.integrations.gsheets import receipt_to_sheet_row
+from slipstream.integrations.gsheets import receipt_to_sheet_row, receipts_to_rows
 from slipstream.models import Receipt, ReceiptItem
 
 pytestmark = pytest.mark.unit
@@ -234,3 +234,22 @@ def test_receipt_to_sheet_row_column_order():
     assert row[2] == "TWD"  # Currency
     assert row[3] == 100.0  # Total
     assert row[4] == "https://drive.google.com/file/d/file123/view"  # Image URL
+
+
+def test_receipts_to_rows_matches_per_receipt_mapping():
+    """Test that batch conversion matches receipt_to_sheet_row, in order."""
+    receipts = [
+        Receipt(
+            merchant_name=f"Store {i}",
+            date="2024-01-15",
+            currency="TWD",
+            total_amount=10.0 * i,
+            confidence_score=0.9,
+            raw_text="text",
+            file_id=f"file{i}" if i % 2 else None,
+        )
+        for i in range(4)
+    ]
+
+    assert receipts_to_rows(receipts) == [receipt_to_sheet_row(r) for r in receipts]
+    assert receipts_to_rows([]) == []
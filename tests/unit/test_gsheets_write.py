@@ -1,8 +1,10 @@
 """Unit tests for GSheetsClient write operations."""
 
+import time
 import unittest.mock as mock
 
 import pytest
+from googleapiclient.errors import HttpError
 
 from slipstream.integrations.gsheets import GSheetsClient
 
@@ -169,3 +171,62 @@ def test_append_row_with_empty_values(mock_google_build):
         valueInputOption="RAW",
         body={"values": [[]]},
     )
+
+
+def test_append_rows_buffered_flushes_when_batch_is_full(mock_google_build):
+    """Test that buffered rows are coalesced into one append per batch."""
+    mock_values = mock_google_build.spreadsheets.return_value.values.return_value
+
+    client = GSheetsClient(spreadsheet_id="test-sheet-123")
+    assert client.append_rows_buffered([["a"]], max_batch=3) is None
+    assert client.append_rows_buffered([["b"]], max_batch=3) is None
+    mock_values.append.assert_not_called()
+
+    client.append_rows_buffered([["c"], ["d"]], max_batch=3)
+
+    mock_values.append.assert_called_once()
+    body = mock_values.append.call_args.kwargs["body"]
+    assert body == {"values": [["a"], ["b"], ["c"], ["d"]]}
+
+
+def test_append_rows_buffered_flushes_when_buffer_is_stale(mock_google_build):
+    """Test that the buffer is flushed once the oldest row exceeds max_age_s."""
+    mock_values = mock_google_build.spreadsheets.return_value.values.return_value
+
+    client = GSheetsClient(spreadsheet_id="test-sheet-123")
+    client.append_rows_buffered([["a"]], max_age_s=0.05)
+    mock_values.append.assert_not_called()
+    time.sleep(0.06)
+    client.append_rows_buffered([["b"]], max_age_s=0.05)
+
+    body = mock_values.append.call_args.kwargs["body"]
+    assert body == {"values": [["a"], ["b"]]}
+
+
+def test_flush_writes_remaining_rows_once(mock_google_build):
+    """Test that flush writes leftover rows and is a no-op when empty."""
+    mock_values = mock_google_build.spreadsheets.return_value.values.return_value
+
+    client = GSheetsClient(spreadsheet_id="test-sheet-123")
+    client.append_rows_buffered([["a"]])
+    client.flush()
+    assert client.flush() is None
+
+    mock_values.append.assert_called_once()
+
+
+def test_flush_keeps_rows_when_append_fails(mock_google_build):
+    """Test that rows from a failed flush are written by the next flush."""
+    mock_values = mock_google_build.spreadsheets.return_value.values.return_value
+    bad_request = HttpError(mock.Mock(status=400), b"Bad request")
+    mock_values.append.return_value.execute.side_effect = [bad_request, {}]
+
+    client = GSheetsClient(spreadsheet_id="test-sheet-123")
+    client.append_rows_buffered([["a"]])
+    with pytest.raises(HttpError):
+        client.flush()
+    client.append_rows_buffered([["b"]])
+    client.flush()
+
+    body = mock_values.append.call_args.kwargs["body"]
+    assert body == {"values": [["a"], ["b"]]}
@@ -346,3 +346,26 @@ def test_export_receipts_url_column_is_last(tmp_path: Path) -> None:
 
     assert header[4] == "圖片連結"  # 5th column header
     assert data[4] == "https://drive.google.com/file/d/file123/view"  # 5th column data
+
+
+def test_export_receipts_quotes_embedded_separators(tmp_path: Path) -> None:
+    """Verify merchant names with commas, quotes, and newlines round-trip."""
+    export_path = tmp_path / "receipts.csv"
+    exporter = LocalExporter()
+
+    receipt = Receipt(
+        merchant_name='Joe\'s "Diner", Inc.\nBranch 2',
+        date="2024-12-28",
+        total_amount=100.0,
+        currency="TWD",
+        confidence_score=0.95,
+        raw_text="Receipt",
+    )
+
+    exporter.export([receipt], export_path)
+
+    with open(export_path, encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.reader(f))
+
+    assert len(rows) == 2
+    assert rows[1][0] == 'Joe\'s "Diner", Inc.\nBranch 2'
@@ -1,10 +1,14 @@
 """Unit tests for OCR Engine using Google Vision API."""
 
-from unittest.mock import MagicMock, Mock, patch
+import os
+import threading
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from google.api_core.exceptions import GoogleAPIError
+from google.cloud import vision
 
-from slipstream.integrations.ocr import OCREngine
+from slipstream.integrations.ocr import OCREngine, _pdf_text_layer
 
 
 class TestOCREngineInitialization:
@@ -17,6 +21,14 @@ class TestOCREngineInitialization:
             assert engine is not None
             assert engine.client is not None
 
+    def test_ocr_engines_share_default_client(self):
+        """Test that engines without a custom client share one Vision client."""
+        with patch(
+            "slipstream.integrations.ocr.vision.ImageAnnotatorClient"
+        ) as client_class:
+            assert OCREngine().client is OCREngine().client
+            client_class.assert_called_once()
+
     def test_ocr_engine_accepts_custom_client(self):
         """Test that OCREngine can be initialized with a custom client."""
         mock_client = Mock()
@@ -43,16 +55,10 @@ class TestTextExtraction:
         assert len(result) > 0
         assert "RECEIPT" in result or "Store Name" in result
 
-    @patch("slipstream.integrations.ocr.Path")
-    def test_extract_text_calls_vision_api_with_image(self, mock_path_class):
+    def test_extract_text_calls_vision_api_with_image(self, tmp_path):
         """Test that extract_text properly calls the Vision API."""
-        # Mock file system
-        mock_path = MagicMock()
-        mock_path.exists.return_value = True
-        mock_file = MagicMock()
-        mock_file.read.return_value = b"fake image data"
-        mock_path.open.return_value.__enter__.return_value = mock_file
-        mock_path_class.return_value = mock_path
+        image_file = tmp_path / "image.png"
+        image_file.write_bytes(b"fake image data")
 
         mock_client = Mock()
         mock_response = Mock()
@@ -62,11 +68,61 @@ class TestTextExtraction:
         mock_client.text_detection.return_value = mock_response
 
         engine = OCREngine(client=mock_client)
-        result = engine.extract_text("tests/dataset/test.png")
+        result = engine.extract_text(str(image_file))
 
         mock_client.text_detection.assert_called_once()
         assert result == "Test text"
 
+    def test_extract_text_sends_file_bytes_and_drops_page_cache(self, tmp_path):
+        """Test that the image is read whole and evicted from the page cache."""
+        image_file = tmp_path / "image.png"
+        image_file.write_bytes(b"x" * 100_000)
+
+        mock_client = Mock()
+        mock_client.text_detection.return_value = Mock(text_annotations=[])
+
+        engine = OCREngine(client=mock_client)
+        with patch("slipstream.integrations.ocr.os.posix_fadvise") as fadvise:
+            engine.extract_text(str(image_file))
+
+        image = mock_client.text_detection.call_args.kwargs["image"]
+        assert image.content == b"x" * 100_000
+        advice = [call.args[3] for call in fadvise.call_args_list]
+        assert advice == [
+            os.POSIX_FADV_SEQUENTIAL,
+            os.POSIX_FADV_DONTNEED,
+        ]
+
+    def test_extract_text_from_gcs_sends_uri_not_bytes(self):
+        """Test that GCS-hosted images are referenced by URI."""
+        mock_client = Mock()
+        mock_annotation = Mock(description="GCS text")
+        mock_client.text_detection.return_value = Mock(
+            text_annotations=[mock_annotation]
+        )
+
+        engine = OCREngine(client=mock_client)
+        result = engine.extract_text_from_gcs("gs://bucket/receipt.jpg")
+
+        image = mock_client.text_detection.call_args.kwargs["image"]
+        assert image.source.gcs_image_uri == "gs://bucket/receipt.jpg"
+        assert image.content == b""
+        assert result == "GCS text"
+
+    def test_extract_text_from_bytes_skips_filesystem(self):
+        """Test that in-memory image bytes are sent without any file access."""
+        mock_client = Mock()
+        mock_client.text_detection.return_value = Mock(
+            text_annotations=[Mock(description="In-memory text")]
+        )
+
+        engine = OCREngine(client=mock_client)
+        result = engine.extract_text_from_bytes(b"image bytes")
+
+        image = mock_client.text_detection.call_args.kwargs["image"]
+        assert image.content == b"image bytes"
+        assert result == "In-memory text"
+
 
 class TestErrorHandling:
     """Test error handling for various failure scenarios."""
@@ -79,16 +135,10 @@ class TestErrorHandling:
         with pytest.raises(FileNotFoundError):
             engine.extract_text("/invalid/path/to/image.png")
 
-    @patch("slipstream.integrations.ocr.Path")
-    def test_extract_text_handles_empty_response(self, mock_path_class):
+    def test_extract_text_handles_empty_response(self, tmp_path):
         """Test that extract_text returns empty string when no text is found."""
-        # Mock file system
-        mock_path = MagicMock()
-        mock_path.exists.return_value = True
-        mock_file = MagicMock()
-        mock_file.read.return_value = b"fake image data"
-        mock_path.open.return_value.__enter__.return_value = mock_file
-        mock_path_class.return_value = mock_path
+        image_file = tmp_path / "image.png"
+        image_file.write_bytes(b"fake image data")
 
         mock_client = Mock()
         mock_response = Mock()
@@ -96,14 +146,12 @@ class TestErrorHandling:
         mock_client.text_detection.return_value = mock_response
 
         engine = OCREngine(client=mock_client)
-        result = engine.extract_text("tests/dataset/blank.jpg")
+        result = engine.extract_text(str(image_file))
 
         assert result == ""
 
     def test_extract_text_handles_api_errors_gracefully(self):
         """Test that extract_text handles Google API errors gracefully."""
-        from google.api_core.exceptions import GoogleAPIError
-
         mock_client = Mock()
         mock_client.text_detection.side_effect = GoogleAPIError("Quota exceeded")
 
@@ -121,19 +169,14 @@ class TestAdvancedScenarios:
         mock_client = Mock()
         engine = OCREngine(client=mock_client)
 
-        with pytest.raises(FileNotFoundError):
+        with pytest.raises(FileNotFoundError, match="Not a regular file"):
             engine.extract_text("tests/dataset/")
+        mock_client.text_detection.assert_not_called()
 
-    @patch("slipstream.integrations.ocr.Path")
-    def test_extract_text_with_multilingual_content(self, mock_path_class):
+    def test_extract_text_with_multilingual_content(self, tmp_path):
         """Test that extract_text handles multilingual text (CJK characters)."""
-        # Mock file system
-        mock_path = MagicMock()
-        mock_path.exists.return_value = True
-        mock_file = MagicMock()
-        mock_file.read.return_value = b"fake image data"
-        mock_path.open.return_value.__enter__.return_value = mock_file
-        mock_path_class.return_value = mock_path
+        image_file = tmp_path / "image.png"
+        image_file.write_bytes(b"fake image data")
 
         mock_client = Mock()
         mock_response = Mock()
@@ -144,21 +187,15 @@ class TestAdvancedScenarios:
         mock_client.text_detection.return_value = mock_response
 
         engine = OCREngine(client=mock_client)
-        result = engine.extract_text("tests/dataset/receipt_multilang.png")
+        result = engine.extract_text(str(image_file))
 
         assert isinstance(result, str)
         assert "レシート" in result or "谢谢" in result
 
-    @patch("slipstream.integrations.ocr.Path")
-    def test_extract_text_handles_partial_text_recognition(self, mock_path_class):
+    def test_extract_text_handles_partial_text_recognition(self, tmp_path):
         """Test handling of low-quality images with partial text recognition."""
-        # Mock file system
-        mock_path = MagicMock()
-        mock_path.exists.return_value = True
-        mock_file = MagicMock()
-        mock_file.read.return_value = b"fake blurry image data"
-        mock_path.open.return_value.__enter__.return_value = mock_file
-        mock_path_class.return_value = mock_path
+        image_file = tmp_path / "image.png"
+        image_file.write_bytes(b"fake blurry image data")
 
         mock_client = Mock()
         mock_response = Mock()
@@ -169,8 +206,217 @@ class TestAdvancedScenarios:
         mock_client.text_detection.return_value = mock_response
 
         engine = OCREngine(client=mock_client)
-        result = engine.extract_text("tests/dataset/blurry_receipt.png")
+        result = engine.extract_text(str(image_file))
 
         # Should return whatever it could recognize without crashing
         assert isinstance(result, str)
         assert len(result) > 0
+
+
+def _text_response(text: str) -> vision.AnnotateImageResponse:
+    """Build a Vision response containing the given full text."""
+    return vision.AnnotateImageResponse(
+        text_annotations=[vision.EntityAnnotation(description=text)]
+    )
+
+
+class TestPdfTextFastPath:
+    """Test that text-bearing PDFs skip OCR."""
+
+    def test_extract_text_uses_pdf_text_layer(self, tmp_path):
+        """Test that a PDF with enough embedded text is not sent to Vision."""
+        pdf_path = tmp_path / "receipt.pdf"
+        pdf_path.write_bytes(b"%PDF-1.7")
+        layer = "Store Name\n" + "Coffee 1 x 120.00\n" * 5 + "Total: 600.00"
+        mock_client = Mock()
+
+        with patch(
+            "slipstream.integrations.ocr._pdf_text_layer", return_value=layer
+        ) as text_layer:
+            result = OCREngine(client=mock_client).extract_text(str(pdf_path))
+
+        assert result == layer
+        text_layer.assert_called_once_with(str(pdf_path))
+        mock_client.text_detection.assert_not_called()
+
+    def test_extract_text_ocrs_pdf_with_short_text_layer(self, tmp_path):
+        """Test that a scanned PDF (little or no text layer) falls back to OCR."""
+        pdf_path = tmp_path / "scan.pdf"
+        pdf_path.write_bytes(b"%PDF-1.7")
+        mock_client = Mock()
+        mock_client.text_detection.return_value.text_annotations = [
+            Mock(description="OCR text")
+        ]
+
+        with patch("slipstream.integrations.ocr._pdf_text_layer", return_value="  "):
+            result = OCREngine(client=mock_client).extract_text(str(pdf_path))
+
+        assert result == "OCR text"
+        mock_client.text_detection.assert_called_once()
+
+    def test_extract_text_fast_path_can_be_disabled(self, tmp_path):
+        """Test that pdf_text_fast_path=False always runs OCR."""
+        pdf_path = tmp_path / "receipt.pdf"
+        pdf_path.write_bytes(b"%PDF-1.7")
+        mock_client = Mock()
+        mock_client.text_detection.return_value.text_annotations = []
+
+        with patch("slipstream.integrations.ocr._pdf_text_layer") as text_layer:
+            engine = OCREngine(client=mock_client, pdf_text_fast_path=False)
+            engine.extract_text(str(pdf_path))
+
+        text_layer.assert_not_called()
+        mock_client.text_detection.assert_called_once()
+
+    def test_pdf_text_layer_is_empty_without_pypdfium2(self, tmp_path):
+        """Test that PDFs fall back to OCR when pypdfium2 is not installed."""
+        with patch("slipstream.integrations.ocr.pdfium", None):
+            assert _pdf_text_layer(str(tmp_path / "receipt.pdf")) == ""
+
+
+class TestBatchTextExtraction:
+    """Test batched async text extraction."""
+
+    @pytest.mark.asyncio
+    async def test_extract_text_batch_returns_text_in_order(self):
+        """Test that batch results map back to their input paths."""
+        mock_async_client = Mock()
+        mock_async_client.batch_annotate_images = AsyncMock(
+            return_value=vision.BatchAnnotateImagesResponse(
+                responses=[_text_response("first"), _text_response("second")]
+            )
+        )
+
+        engine = OCREngine(client=Mock(), async_client=mock_async_client)
+        results = await engine.extract_text_batch(
+            ["tests/dataset/receipt_en.jpg", "tests/dataset/receipt_jp.jpg"]
+        )
+
+        assert results == ["first", "second"]
+        mock_async_client.batch_annotate_images.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_extract_text_batch_splits_into_rpc_sized_batches(self):
+        """Test that more than 16 images are sent as multiple RPCs."""
+
+        async def annotate(requests):
+            return vision.BatchAnnotateImagesResponse(
+                responses=[_text_response("text") for _ in requests]
+            )
+
+        mock_async_client = Mock()
+        mock_async_client.batch_annotate_images = AsyncMock(side_effect=annotate)
+
+        engine = OCREngine(client=Mock(), async_client=mock_async_client)
+        results = await engine.extract_text_batch(["tests/dataset/receipt_en.jpg"] * 20)
+
+        assert results == ["text"] * 20
+        batch_sizes = [
+            len(call.kwargs["requests"])
+            for call in mock_async_client.batch_annotate_images.await_args_list
+        ]
+        assert sorted(batch_sizes) == [4, 16]
+
+    @pytest.mark.asyncio
+    async def test_extract_text_batch_isolates_per_image_errors(self):
+        """Test that a missing file or per-image API error affects only that image."""
+        mock_async_client = Mock()
+        mock_async_client.batch_annotate_images = AsyncMock(
+            return_value=vision.BatchAnnotateImagesResponse(
+                responses=[
+                    vision.AnnotateImageResponse(
+                        error={"code": 3, "message": "Bad image data"}
+                    ),
+                    vision.AnnotateImageResponse(),
+                ]
+            )
+        )
+
+        engine = OCREngine(client=Mock(), async_client=mock_async_client)
+        results = await engine.extract_text_batch(
+            [
+                "tests/dataset/receipt_en.jpg",
+                "/invalid/path/to/image.png",
+                "tests/dataset/receipt_kr.jpg",
+            ]
+        )
+
+        assert isinstance(results[0], GoogleAPIError)
+        assert "Bad image data" in str(results[0])
+        assert isinstance(results[1], FileNotFoundError)
+        assert results[2] == ""
+
+
+@pytest.mark.asyncio
+async def test_extract_text_batch_reads_pdfs_from_text_layer(tmp_path):
+    """Test that PDFs in a batch use their text layer and skip Vision."""
+    pdf_path = tmp_path / "invoice.pdf"
+    pdf_path.write_bytes(b"%PDF-1.7")
+    layer = "Store Name\n" + "Coffee 1 x 120.00\n" * 5 + "Total: 600.00"
+    mock_async_client = Mock()
+    mock_async_client.batch_annotate_images = AsyncMock(
+        return_value=vision.BatchAnnotateImagesResponse(
+            responses=[_text_response("image text")]
+        )
+    )
+
+    engine = OCREngine(client=Mock(), async_client=mock_async_client)
+    with patch("slipstream.integrations.ocr._pdf_text_layer", return_value=layer):
+        results = await engine.extract_text_batch(
+            [str(pdf_path), "tests/dataset/receipt_en.jpg"]
+        )
+
+    assert results == [layer, "image text"]
+    requests = mock_async_client.batch_annotate_images.await_args.kwargs["requests"]
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_extract_text_batch_rejects_pdfs_without_text_layer(tmp_path):
+    """Test that a scanned PDF in a batch is reported, not sent to Vision."""
+    pdf_path = tmp_path / "scan.pdf"
+    pdf_path.write_bytes(b"%PDF-1.7")
+    mock_async_client = Mock()
+    mock_async_client.batch_annotate_images = AsyncMock()
+
+    engine = OCREngine(client=Mock(), async_client=mock_async_client)
+    with patch("slipstream.integrations.ocr._pdf_text_layer", return_value=""):
+        results = await engine.extract_text_batch([str(pdf_path)])
+
+    assert isinstance(results[0], ValueError)
+    mock_async_client.batch_annotate_images.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_extract_text_batch_reads_images_concurrently(tmp_path, monkeypatch):
+    """Test that a batch's image reads overlap instead of running one at a time."""
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.jpg"
+        path.write_bytes(name.encode())
+        paths.append(str(path))
+
+    # Every read of a batch image waits for the others, which only succeeds
+    # if all three are in flight at once
+    barrier = threading.Barrier(3, timeout=5)
+    real_open = os.open
+
+    def open_after_barrier(path, *args, **kwargs):
+        if path in paths:
+            barrier.wait()
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "open", open_after_barrier)
+    mock_async_client = Mock()
+    mock_async_client.batch_annotate_images = AsyncMock(
+        return_value=vision.BatchAnnotateImagesResponse(
+            responses=[_text_response(name) for name in ("a", "b", "c")]
+        )
+    )
+
+    engine = OCREngine(client=Mock(), async_client=mock_async_client)
+    results = await engine.extract_text_batch(paths)
+
+    assert results == ["a", "b", "c"]
+    requests = mock_async_client.batch_annotate_images.await_args.kwargs["requests"]
+    assert [request.image.content for request in requests] == [b"a", b"b", b"c"]
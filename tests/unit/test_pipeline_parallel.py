@@ -1,6 +1,7 @@
 """Tests for parallel pipeline implementation."""
 
 import asyncio
+import io
 import time
 import unittest.mock as mock
 
@@ -9,46 +10,51 @@ import pytest
 pytestmark = pytest.mark.unit
 
 
-def test_gdrive_parallel_download_creates_thread_local_services(tmp_path):
-    """Test that parallel downloads create thread-local services.
+def _media_response(body: bytes = b"image bytes"):
+    """Build a mock streaming response for the Drive media endpoint."""
+    response = mock.MagicMock()
+    response.__enter__.return_value = response
+    response.raw = io.BytesIO(body)
+    return response
 
-    Due to threading/SSL issues with httplib2, each thread needs its own
-    service instance for thread safety. This test verifies that behavior.
-    """
-    from slipstream.integrations.gdrive import GDriveClient
-
-    with mock.patch("slipstream.integrations.gdrive.build") as mock_build:
-        mock_service = mock.Mock()
-        mock_build.return_value = mock_service
-
-        # Mock the MediaIoBaseDownload to simulate successful downloads
-        with mock.patch(
-            "slipstream.integrations.gdrive.MediaIoBaseDownload"
-        ) as mock_download:
-            mock_instance = mock_download.return_value
-            mock_instance.next_chunk.return_value = (None, True)
 
-            # Create client and download 3 files
-            client = GDriveClient(max_workers=2)
-            files = [
-                {"id": "file1", "name": "receipt1.jpg"},
-                {"id": "file2", "name": "receipt2.png"},
-                {"id": "file3", "name": "receipt3.pdf"},
-            ]
+def test_gdrive_parallel_download_shares_one_session(tmp_path):
+    """Test that parallel downloads share one pooled session.
 
-            # download_files is now a generator
-            results = list(client.download_files(files, tmp_path))
-
-            # Verify all files were processed
-            assert len(results) == 3
-            assert all(r.success for r in results)
+    A single session keeps one connection pool and one set of credentials
+    for the whole process, instead of one per download thread.
+    """
+    from slipstream.integrations.gdrive import GDriveClient
 
-            # build() is called once for init + once per download thread
-            # This is necessary for thread safety with httplib2
-            assert mock_build.call_count >= 1, (
-                f"Expected build() to be called at least once, got "
-                f"{mock_build.call_count}"
-            )
+    with (
+        mock.patch("slipstream.integrations.gdrive._session", None),
+        mock.patch("slipstream.integrations.gdrive._refresh_credentials"),
+        mock.patch("slipstream.integrations.gdrive._get_credentials"),
+        mock.patch(
+            "slipstream.integrations.gdrive.AuthorizedSession"
+        ) as mock_session_cls,
+    ):
+        mock_session_cls.return_value.get.side_effect = lambda url, **kwargs: (
+            _media_response()
+        )
+
+        # Create client and download 3 files
+        client = GDriveClient(max_workers=2)
+        files = [
+            {"id": "file1", "name": "receipt1.jpg"},
+            {"id": "file2", "name": "receipt2.png"},
+            {"id": "file3", "name": "receipt3.pdf"},
+        ]
+
+        # download_files is now a generator
+        results = list(client.download_files(files, tmp_path))
+
+        # Verify all files were processed
+        assert len(results) == 3
+        assert all(r.success for r in results)
+
+        # Exactly one session for the whole process
+        mock_session_cls.assert_called_once()
 
 
 def test_download_files_yields_as_completed(tmp_path):
@@ -59,33 +65,31 @@ def test_download_files_yields_as_completed(tmp_path):
     """
     from slipstream.integrations.gdrive import GDriveClient
 
-    with mock.patch("slipstream.integrations.gdrive.build") as mock_build:
-        mock_service = mock.Mock()
-        mock_build.return_value = mock_service
-
-        with mock.patch(
-            "slipstream.integrations.gdrive.MediaIoBaseDownload"
-        ) as mock_download:
-            mock_instance = mock_download.return_value
-            mock_instance.next_chunk.return_value = (None, True)
-
-            client = GDriveClient(max_workers=2)
-            files = [
-                {"id": "file1", "name": "receipt1.jpg"},
-                {"id": "file2", "name": "receipt2.png"},
-                {"id": "file3", "name": "receipt3.pdf"},
-            ]
-
-            # Consume the generator and track when we get each result
-            results_received = []
-            for result in client.download_files(files, tmp_path):
-                results_received.append(result)
-                # Verify we can process this result immediately
-                assert result.success is True
-                assert result.file_id is not None
-
-            # All 3 files should have been yielded
-            assert len(results_received) == 3
+    with (
+        mock.patch("slipstream.integrations.gdrive._refresh_credentials"),
+        mock.patch("slipstream.integrations.gdrive._get_session") as mock_get_session,
+    ):
+        mock_get_session.return_value.get.side_effect = lambda url, **kwargs: (
+            _media_response()
+        )
+
+        client = GDriveClient(max_workers=2)
+        files = [
+            {"id": "file1", "name": "receipt1.jpg"},
+            {"id": "file2", "name": "receipt2.png"},
+            {"id": "file3", "name": "receipt3.pdf"},
+        ]
+
+        # Consume the generator and track when we get each result
+        results_received = []
+        for result in client.download_files(files, tmp_path):
+            results_received.append(result)
+            # Verify we can process this result immediately
+            assert result.success is True
+            assert result.file_id is not None
+
+        # All 3 files should have been yielded
+        assert len(results_received) == 3
 
 
 @pytest.mark.asyncio
@@ -149,3 +153,46 @@ async def test_pipeline_is_actually_parallel():
         f"This suggests sequential processing (expected < 0.6s for parallel). "
         f"Sequential would take ~0.9s, parallel should take ~0.3s."
     )
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline_bounds_ocr_concurrency(tmp_path):
+    """Test that no more than `workers` OCR calls run at once."""
+    import threading
+
+    from slipstream.integrations.gdrive import DownloadResult
+    from slipstream.integrations.ocr import OCREngine
+    from slipstream.main import run_pipeline
+
+    def downloads():
+        for i in range(6):
+            dest = tmp_path / f"r{i}.jpg"
+            dest.write_bytes(b"image")
+            yield DownloadResult(success=True, file_id=f"f{i}", dest_path=dest)
+
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+    thread_names = set()
+
+    def blocking_ocr(path):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+            thread_names.add(threading.current_thread().name)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return "text"
+
+    ocr_engine = mock.Mock(spec=OCREngine)
+    ocr_engine.extract_text.side_effect = blocking_ocr
+
+    results = await run_pipeline(
+        download_results=downloads(), ocr_engine=ocr_engine, workers=2
+    )
+
+    assert all(r.ocr_text == "text" for r in results)
+    assert peak <= 2
+    assert all(name.startswith("ocr") for name in thread_names)
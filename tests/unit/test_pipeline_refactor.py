@@ -363,3 +363,112 @@ class TestRunPipelineRefactor:
         # Should have events for OCR success at minimum
         event_types = [e[0] for e in progress_events]
         assert "ocr_success" in event_types
+
+    @pytest.mark.asyncio
+    async def test_run_pipeline_overlaps_downloads_with_processing(self, tmp_path):
+        """Test that OCR starts while later downloads are still in progress."""
+        download_finished_at = 0.0
+
+        # Setup - the generator blocks between files like a real download
+        def mock_download_generator() -> Generator[DownloadResult, None, None]:
+            nonlocal download_finished_at
+            dest1 = tmp_path / "r1.jpg"
+            dest1.write_text("fake data 1")
+            yield DownloadResult(success=True, file_id="f1", dest_path=dest1)
+
+            time.sleep(0.2)
+            dest2 = tmp_path / "r2.jpg"
+            dest2.write_text("fake data 2")
+            yield DownloadResult(success=True, file_id="f2", dest_path=dest2)
+            download_finished_at = time.monotonic()
+
+        ocr_started_at = []
+
+        def recording_ocr(path):
+            ocr_started_at.append(time.monotonic())
+            return "OCR text"
+
+        mock_ocr = Mock(spec=OCREngine)
+        mock_ocr.extract_text.side_effect = recording_ocr
+
+        # Execute
+        results = await run_pipeline(
+            download_results=mock_download_generator(),
+            ocr_engine=mock_ocr,
+            extractor=None,
+        )
+
+        # Verify - first file was OCR'd before the second download finished
+        assert [r.file_id for r in results] == ["f1", "f2"]
+        assert min(ocr_started_at) < download_finished_at
+
+    @pytest.mark.asyncio
+    async def test_run_pipeline_propagates_download_generator_error(self, tmp_path):
+        """Test that an exception from the download generator is raised."""
+
+        def failing_generator() -> Generator[DownloadResult, None, None]:
+            raise RuntimeError("listing failed")
+            yield  # pragma: no cover
+
+        mock_ocr = Mock(spec=OCREngine)
+
+        with pytest.raises(RuntimeError, match="listing failed"):
+            await run_pipeline(
+                download_results=failing_generator(),
+                ocr_engine=mock_ocr,
+                extractor=None,
+            )
+
+    @pytest.mark.asyncio
+    async def test_run_pipeline_batch_extraction(self, tmp_path):
+        """Test that batch mode submits all OCR texts in one batch call."""
+
+        def mock_download_generator() -> Generator[DownloadResult, None, None]:
+            for i in range(3):
+                dest = tmp_path / f"r{i}.jpg"
+                dest.write_text(f"fake data {i}")
+                yield DownloadResult(success=True, file_id=f"f{i}", dest_path=dest)
+
+        def ocr(path):
+            if "r1" in str(path):
+                raise Exception("OCR error on r1")
+            return f"text {path[-5]}"
+
+        mock_ocr = Mock(spec=OCREngine)
+        mock_ocr.extract_text.side_effect = ocr
+
+        mock_receipt = Receipt(
+            merchant_name="Test Store",
+            date="2024-01-15",
+            total_amount=42.50,
+            currency="TWD",
+            confidence_score=0.95,
+            raw_text="text 0",
+        )
+        mock_extraction = ExtractionResult(
+            receipt=mock_receipt,
+            input_tokens=100,
+            output_tokens=50,
+            processing_time=1.5,
+        )
+        mock_extractor = Mock(spec=AnthropicExtractor)
+        mock_extractor.extract_receipts_batch = AsyncMock(
+            return_value=[mock_extraction, ExtractionRefusedError("Model refused")]
+        )
+
+        # Execute
+        results = await run_pipeline(
+            download_results=mock_download_generator(),
+            ocr_engine=mock_ocr,
+            extractor=mock_extractor,
+            batch_extraction=True,
+        )
+
+        # Verify - only files with OCR text were submitted, in order
+        mock_extractor.extract_receipt_data.assert_not_called()
+        mock_extractor.extract_receipts_batch.assert_awaited_once_with(
+            ["text 0", "text 2"]
+        )
+        assert results[0].extraction_result.receipt.file_id == "f0"
+        assert results[1].extraction_error is None
+        assert "Model refused" in results[2].extraction_error
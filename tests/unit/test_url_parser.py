@@ -51,3 +51,16 @@ def test_parse_google_id(input_str, expected_id):
 def test_parse_google_id_errors(input_str, match):
     with pytest.raises(URLParserError, match=match):
         parse_google_id(input_str)
+
+
+@pytest.mark.parametrize(
+    ("input_str", "match"),
+    [
+        ("https://drive.google.com.evil.com/file/d/abc", "Unsupported URL domain"),
+        ("https://drive.google.com?next=/file/d/abc", "Could not find ID in URL"),
+        ("https://drive.google.com/open#/file/d/abc", "Could not find ID in URL"),
+    ],
+)
+def test_parse_google_id_checks_host_and_path_only(input_str, match):
+    with pytest.raises(URLParserError, match=match):
+        parse_google_id(input_str)